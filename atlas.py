@@ -0,0 +1,140 @@
+"""Persistent on-disk atlases of pre-rotated spinner sprites.
+
+An atlas holds every rotation step of one image at one size as raw RGBA
+frames, back to back after a small header. Its file name is built from the
+image's content hash, the sprite side and the number of rotation steps, so
+an edited image or a new radius never picks up a stale atlas. Opening an
+atlas maps the file instead of reading it, so a warm start skips PNG
+decoding and resampling and only pages in the frames actually shown.
+
+Opening an atlas marks it as recently used, and prune_cache() deletes the
+least recently used files once the cache grows past CACHE_LIMIT bytes.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+
+from PIL import Image
+
+MAGIC = b'SPAT'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sBHH')  # magic, version, side, steps
+
+CACHE_LIMIT = 256 * 2**20  # Bytes of atlases kept, about six at the default size
+
+def cache_dir():
+    """Directory holding atlas files ($SPINNER_CACHE_DIR or ~/.cache/spinner)."""
+    return os.environ.get('SPINNER_CACHE_DIR') or os.path.join(
+        os.path.expanduser('~'), '.cache', 'spinner')
+
+def atlas_path(image_path, side, steps, directory=None):
+    """Cache file for image_path resized to side and rotated in steps."""
+    with open(image_path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:32]
+    return os.path.join(directory or cache_dir(), f"{digest}_{side}_{steps}.rgba")
+
+class SpriteAtlas:
+    """Read-only view of an atlas file."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.side, self.steps = _HEADER.unpack_from(self.map, 0)
+        self.frame_size = self.side * self.side * 4
+        if (magic != MAGIC or version != VERSION
+                or len(self.map) != _HEADER.size + self.steps * self.frame_size):
+            self.map.close()
+            raise ValueError(f"Not a sprite atlas: {path}")
+        self.path = path
+
+    def frame(self, step):
+        """Rotation step as an RGBA image sharing the mapped memory."""
+        offset = _HEADER.size + (step % self.steps) * self.frame_size
+        data = memoryview(self.map)[offset:offset + self.frame_size]
+        return Image.frombuffer('RGBA', (self.side, self.side), data, 'raw', 'RGBA', 0, 1)
+
+    def close(self):
+        """Unmap the file.
+
+        Frames still alive keep their pages mapped; the mapping then goes
+        away with the last of them.
+        """
+        try:
+            self.map.close()
+        except BufferError:
+            pass
+
+def build_atlas(path, sprite, steps):
+    """Rotate sprite through every step and write the frames to path.
+
+    Written to a temporary file and renamed, so a crash or a concurrent
+    launch never leaves a truncated atlas under the final name.
+    """
+    sprite = sprite.convert('RGBA')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, sprite.width, steps))
+            for step in range(steps):
+                f.write(sprite.rotate(-step * 360 / steps).tobytes())  # Negative for clockwise rotation
+        os.replace(temp, path)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+
+def open_atlas(image_path, side, steps, directory=None):
+    """The cached atlas for these settings, or None if there isn't one yet."""
+    path = atlas_path(image_path, side, steps, directory)
+    if not os.path.exists(path):
+        return None
+    try:
+        atlas = SpriteAtlas(path)
+    except (OSError, ValueError):
+        return None
+    try:
+        os.utime(path)  # Recently used, for prune_cache()
+    except OSError:
+        pass
+    return atlas
+
+def prune_cache(limit=CACHE_LIMIT, directory=None, keep=()):
+    """Delete least recently used atlases until the cache fits in limit bytes.
+
+    Files in keep are never deleted. Returns the number of files removed.
+    """
+    directory = directory or cache_dir()
+    try:
+        names = [name for name in os.listdir(directory) if name.endswith('.rgba')]
+    except OSError:
+        return 0
+    entries = []
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            info = os.stat(path)
+        except OSError:
+            continue
+        entries.append((info.st_mtime, info.st_size, path))
+    entries.sort()  # Least recently used first
+    total = sum(size for _, size, _ in entries)
+    keep = {os.path.abspath(path) for path in keep}
+    removed = 0
+    for _, size, path in entries:
+        if total <= limit:
+            break
+        if os.path.abspath(path) in keep:
+            continue
+        try:
+            # Other processes can keep a deleted atlas mapped; on systems
+            # that refuse to delete open files it is retried next time
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
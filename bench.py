@@ -0,0 +1,215 @@
+"""Frame-rate benchmarks for every spinner style, with baseline comparison.
+
+    python bench.py --output results.json
+    python bench.py --baseline results.json     # exit status 1 on regression
+
+The Tk benchmarks need a display; without one an Xvfb server is started
+when available, otherwise they are skipped.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+from profiler import FrameProfiler
+from physics import SpinnerPhysics
+
+STYLES = ['classic', 'tri', 'gear', 'image']
+ARM_COUNTS = [2, 3, 4, 5, 6]
+RADII = [75, 150, 300]
+IMAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "spinner.png")
+
+def cases(styles, arm_counts, radii):
+    """(style, arm_count, radius) combinations worth measuring.
+
+    Only the classic style draws arm_count arms, so the others run once per
+    radius.
+    """
+    for style in styles:
+        for radius in radii:
+            for arm_count in (arm_counts if style == 'classic' else arm_counts[:1]):
+                yield style, arm_count, radius
+
+def summarize(name, frame_times):
+    """Result record for a list of per-frame durations in seconds."""
+    total = sum(frame_times)
+    result = {'name': name, 'frames': len(frame_times),
+              'fps': len(frame_times) / total if total else float('inf')}
+    for key, value in FrameProfiler.percentiles(frame_times).items():
+        result[f'{key}_ms'] = value
+    return result
+
+def time_frames(draw, frames):
+    """Call draw(i) for each frame and return the durations."""
+    times = []
+    for i in range(frames):
+        start = time.perf_counter()
+        draw(i)
+        times.append(time.perf_counter() - start)
+    return times
+
+def bench_physics(frames):
+    """Headless physics: per-step integration and the batch solver."""
+    results = []
+    physics = SpinnerPhysics(angular_velocity=20, inertia=0.9999999)
+    steps = 100000
+    times = time_frames(lambda i: physics.step(steps), max(frames // 20, 5))
+    record = summarize('physics/step', times)
+    record['steps_per_second'] = steps * record['fps']
+    results.append(record)
+
+    try:
+        import numpy as np
+        from physics import batch_spin_down
+    except ImportError:
+        return results
+    v0 = np.linspace(1, 40, 10000)
+    inertia = np.linspace(0.9, 0.999, 10000)
+    times = time_frames(lambda i: batch_spin_down(v0, inertia), max(frames // 20, 5))
+    record = summarize('physics/batch_spin_down', times)
+    record['spins_per_second'] = len(v0) * record['fps']
+    results.append(record)
+    return results
+
+def bench_offscreen(styles, arm_counts, radii, frames):
+    """Headless rasterizer for each style."""
+    from offscreen import OffscreenRenderer
+    results = []
+    for style, arm_count, radius in cases(styles, arm_counts, radii):
+        renderer = OffscreenRenderer(style=style, size=int(radius * 2.7), arm_count=arm_count,
+                                     arm_length=radius * 2 / 3, spinner_radius=radius,
+                                     image_path=IMAGE_PATH)
+        times = time_frames(lambda i: renderer.render(i * 7.3), frames)
+        results.append(summarize(f'offscreen/{style}/arms{arm_count}/r{radius}', times))
+    return results
+
+def ensure_display():
+    """Make sure Tk can open a window; returns (ok, xvfb_process)."""
+    if os.environ.get('DISPLAY'):
+        return True, None
+    if not shutil.which('Xvfb'):
+        return False, None
+    display = ':97'
+    process = subprocess.Popen(['Xvfb', display, '-screen', '0', '1280x1024x24'],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    # Xvfb creates its socket once it accepts connections, and exits at once
+    # if the display is taken or it can't start
+    socket = f'/tmp/.X11-unix/X{display[1:]}'
+    deadline = time.monotonic() + 5
+    while not os.path.exists(socket):
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.terminate()
+            return False, None
+        time.sleep(0.05)
+    os.environ['DISPLAY'] = display
+    return True, process
+
+def bench_tk(styles, arm_counts, radii, frames):
+    """The real turtle/Tk path: draw_spinner() and a full animate() step."""
+    import spinner
+    spinner.setup(900, 900)
+    spinner.hideturtle()
+    spinner.tracer(False)
+    spinner.resize_me()
+    # Measure drawing alone: no atlas builds or predictor threads running in
+    # the background, and nothing written to the user's sprite cache
+    spinner.config.sprite_cache = False
+    spinner.config.render_workers = 0
+
+    results = []
+    for style, arm_count, radius in cases(styles, arm_counts, radii):
+        spinner.config.spinner_radius = radius
+        spinner.config.arm_length = radius * 2 / 3
+        spinner.state.arm_count = arm_count
+        spinner.geometry.clear_cache()
+        if style == 'image':
+            if not spinner.load_spinner_image(IMAGE_PATH):
+                continue
+        spinner.state.spinner_style = style
+        spinner.physics.angular_velocity = 0
+
+        def draw(i):
+            spinner.physics.turn = i * 7.3
+            spinner.draw_spinner()
+        draw(0)  # Build the retained items outside the measurement
+        results.append(summarize(f'tk/draw_spinner/{style}/arms{arm_count}/r{radius}',
+                                 time_frames(draw, frames)))
+
+        def frame(i):
+            spinner.physics.angular_velocity = 20
+            spinner.advance_frame(1 / 60)
+            spinner.draw_spinner()
+        results.append(summarize(f'tk/frame/{style}/arms{arm_count}/r{radius}',
+                                 time_frames(frame, frames)))
+    spinner.bye()
+    return results
+
+def compare(results, baseline, tolerance):
+    """Lines describing results whose median frame time grew past tolerance.
+
+    The median is compared rather than mean fps so one stray slow frame
+    doesn't flag a regression.
+    """
+    previous = {record['name']: record for record in baseline.get('results', [])}
+    regressions = []
+    for record in results:
+        old = previous.get(record['name'])
+        if old is None or not old['p50_ms']:
+            continue
+        change = record['p50_ms'] / old['p50_ms'] - 1
+        if change > tolerance:
+            regressions.append(f"{record['name']}: p50 {old['p50_ms']:.3f} -> "
+                               f"{record['p50_ms']:.3f} ms ({change:+.1%})")
+    return regressions
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark spinner rendering and physics")
+    parser.add_argument('--frames', type=int, default=200, help="frames per case")
+    parser.add_argument('--styles', nargs='+', default=STYLES, choices=STYLES)
+    parser.add_argument('--radii', nargs='+', type=int, default=RADII)
+    parser.add_argument('--skip-tk', action='store_true', help="only run headless benchmarks")
+    parser.add_argument('--output', metavar='PATH', help="write results as JSON")
+    parser.add_argument('--baseline', metavar='PATH', help="compare against earlier results")
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help="allowed median frame time increase over the baseline (fraction)")
+    args = parser.parse_args(argv)
+
+    results = bench_physics(args.frames)
+    results += bench_offscreen(args.styles, ARM_COUNTS, args.radii, args.frames)
+
+    if not args.skip_tk:
+        ok, xvfb = ensure_display()
+        if ok:
+            try:
+                results += bench_tk(args.styles, ARM_COUNTS, args.radii, args.frames)
+            finally:
+                if xvfb is not None:
+                    xvfb.terminate()
+        else:
+            print("No display and Xvfb unavailable or failed to start; skipping Tk benchmarks",
+                  file=sys.stderr)
+
+    for record in results:
+        print(f"{record['name']:<44} {record['fps']:>10.1f} fps  "
+              f"p50 {record['p50_ms']:7.3f}  p95 {record['p95_ms']:7.3f}  p99 {record['p99_ms']:7.3f} ms")
+
+    report = {'python': sys.version.split()[0], 'platform': sys.platform,
+              'time': time.time(), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
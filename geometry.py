@@ -0,0 +1,207 @@
+"""Spinner style shapes in turtle coordinates, and cached tessellations of them.
+
+Each style is built from the same moves turtle would draw it with, as
+polygons and polylines. tessellate() builds a style once at turn 0 and
+placed() poses it each frame with a single rotation and translation.
+"""
+
+import math
+
+# Shapes are (kind, points, fill, outline, width) tuples in turtle coordinates.
+# kind is 'polygon' (filled, closed) or 'line' (open polyline).
+
+def circle_steps(radius, extent=360):
+    """Number of segments turtle's circle() uses for a radius and extent."""
+    frac = abs(extent) / 360
+    return 1 + int(min(11 + abs(radius) / 6.0, 59.0) * frac)
+
+def circle_points(x, y, heading, radius, steps=None, detail=1.0):
+    """Vertices of the polygon turtle's circle() draws from (x, y) at heading.
+
+    detail scales turtle's segment count down for cheaper, coarser circles.
+    """
+    if steps is None:
+        steps = max(6, int(circle_steps(radius) * detail))
+    h = math.radians(heading)
+    # The circle's center lies to the left of the pen
+    cx = x - radius * math.sin(h)
+    cy = y + radius * math.cos(h)
+    start = h - math.pi / 2
+    step = 2 * math.pi / steps
+    return [(cx + radius * math.cos(start + i * step),
+             cy + radius * math.sin(start + i * step)) for i in range(steps)]
+
+def forward_point(x, y, heading, distance):
+    """Point reached by moving forward from (x, y) at heading."""
+    h = math.radians(heading)
+    return (x + distance * math.cos(h), y + distance * math.sin(h))
+
+def bearing_shapes(position, turn, handle_radius, scale=1.0, detail=1.0):
+    """Central bearing and its detail circle."""
+    x, y = position
+    return [
+        ('polygon', circle_points(x, y, turn, handle_radius, detail=detail), 'gray', 'black', 2 * scale),
+        ('polygon', circle_points(x, y, turn, 10 * scale, detail=detail), 'darkgray', 'black', 2 * scale),
+    ]
+
+def arm_shapes(position, angle, length, scale=1.0, detail=1.0, rings=True):
+    """One arm: connecting line, weighted end circles and decorative ring."""
+    x, y = position
+    end_x, end_y = forward_point(x, y, angle, length)
+    outer = circle_points(end_x, end_y, angle, 30 * scale, detail=detail)
+    shapes = [
+        ('line', [(x, y), (end_x, end_y)], '', 'black', 4 * scale),
+        ('polygon', outer, '#5A5A5A', 'black', 4 * scale),  # Dark gray base
+        ('polygon', circle_points(end_x, end_y, angle, 20 * scale, detail=detail),
+         '#D3D3D3', 'black', 4 * scale),  # Highlight
+        ('polygon', circle_points(end_x, end_y, angle, 10 * scale, detail=detail),
+         '#B8B8B8', 'black', 4 * scale),  # Weight
+    ]
+    if rings:
+        shapes.append(('polygon', outer, '', 'black', 2 * scale))  # Outer decorative ring
+    return shapes
+
+def classic_shapes(position, turn, arm_count, arm_length, scale=1.0, detail=1.0, rings=True):
+    """Classic spinner with evenly spaced arms."""
+    shapes = []
+    for i in range(arm_count):
+        angle = 360 / arm_count * i
+        shapes.extend(arm_shapes(position, angle + turn, arm_length, scale, detail, rings))
+    return shapes
+
+def tri_shapes(position, turn, arm_length, detail=1.0):
+    """Triangular spinner body with metallic circles at the vertices."""
+    x, y = position
+
+    # Trace the same pen path the turtle version filled
+    body = [(x, y)]
+    px, py = x, y
+    for i in range(3):
+        heading = turn + 120 * i
+        px, py = forward_point(px, py, heading, arm_length)
+        body.append((px, py))
+        px, py = forward_point(px, py, heading + 120, arm_length)
+        body.append((px, py))
+    shapes = [('polygon', body, '#50C878', 'black', 2)]  # Emerald green
+
+    for angle in [0, 120, 240]:
+        heading = turn + angle
+        vx, vy = forward_point(x, y, heading, arm_length)
+        shapes.append(('polygon', circle_points(vx, vy, heading, 15, detail=detail),
+                       '#D3D3D3', 'black', 2))
+        shapes.append(('polygon', circle_points(vx, vy, heading, 8, detail=detail),
+                       '#A0A0A0', 'black', 2))
+    return shapes
+
+def gear_shapes(position, turn, arm_length, tooth_count=12, detail=1.0):
+    """Gear spinner: layered metallic body plus rectangular teeth."""
+    x, y = position
+    shapes = [
+        ('polygon', circle_points(x, y, turn, arm_length * 0.7, detail=detail), '#B8B8B8', 'black', 2),
+        ('polygon', circle_points(x, y, turn, arm_length * 0.5, detail=detail), '#969696', 'black', 2),
+        ('polygon', circle_points(x, y, turn, arm_length * 0.3, detail=detail), '#787878', 'black', 2),
+    ]
+    for i in range(tooth_count):
+        heading = turn + 360 / tooth_count * i
+        bx, by = forward_point(x, y, heading, arm_length * 0.7)
+        tx, ty = forward_point(bx, by, heading, 20)
+        # Teeth are drawn turning right, so they extend along the right normal
+        rx, ry = forward_point(0, 0, heading - 90, 10)
+        tooth = [(bx, by), (tx, ty), (tx + rx, ty + ry), (bx + rx, by + ry)]
+        shapes.append(('polygon', tooth, '#D3D3D3', 'black', 2))
+    return shapes
+
+def spinner_shapes(style, position, turn, arm_count, arm_length, handle_radius, scale=1.0,
+                   detail=1.0, rings=True):
+    """All shapes for a vector spinner style, bearing first.
+
+    detail scales circle segment counts; rings=False leaves out the classic
+    arms' decorative rings.
+    """
+    shapes = bearing_shapes(position, turn, handle_radius, scale, detail)
+    if style == 'classic':
+        shapes.extend(classic_shapes(position, turn, arm_count, arm_length, scale, detail, rings))
+    elif style == 'tri':
+        shapes.extend(tri_shapes(position, turn, arm_length, detail))
+    elif style == 'gear':
+        shapes.extend(gear_shapes(position, turn, arm_length, detail=detail))
+    return shapes
+
+class Tessellation:
+    """A spinner style tessellated once at turn 0 around the origin.
+
+    All vertices live in one array, so posing the spinner is a single
+    rotation and translation; placed() then slices the result per shape.
+    """
+
+    def __init__(self, shapes, vectorized=False):
+        self.styles = [(kind, fill, outline, width) for kind, _, fill, outline, width in shapes]
+        self.slices = []
+        xs = []
+        ys = []
+        for _, points, _, _, _ in shapes:
+            start = len(xs) * 2
+            for x, y in points:
+                xs.append(x)
+                ys.append(y)
+            self.slices.append((start, len(xs) * 2))
+        # A spinner has a few hundred vertices, which plain Python rotates in
+        # tens of microseconds, so NumPy (and its import cost) is opt-in
+        self.np = None
+        if vectorized:
+            import numpy
+            self.np = numpy
+        if self.np is not None:
+            self.vertices = self.np.array([xs, ys], dtype=float)
+        else:
+            self.vertices = (xs, ys)
+
+    def placed(self, turn, position, flip_y=False):
+        """Flat [x0, y0, x1, y1, ...] lists per shape, rotated and translated.
+
+        With flip_y the y axis is negated after placement, which maps turtle
+        coordinates to Tk canvas coordinates.
+        """
+        h = math.radians(turn)
+        c = math.cos(h)
+        s = math.sin(h)
+        px, py = position
+        sign = -1 if flip_y else 1
+        if self.np is not None:
+            xs, ys = self.vertices
+            flat = self.np.empty(xs.size * 2)
+            flat[0::2] = xs * c - ys * s + px
+            flat[1::2] = (xs * s + ys * c + py) * sign
+            flat = flat.tolist()
+        else:
+            flat = []
+            for x, y in zip(*self.vertices):
+                flat.append(x * c - y * s + px)
+                flat.append((x * s + y * c + py) * sign)
+        return [flat[start:end] for start, end in self.slices]
+
+# Tessellations by (style, arm_count, arm_length, handle_radius, scale, detail, rings, vectorized)
+_tessellations = {}
+
+def tessellate(style, arm_count, arm_length, handle_radius, scale=1.0, detail=1.0, rings=True,
+               vectorized=False):
+    """Cached Tessellation for a style, its size parameters and detail level.
+
+    vectorized poses it with NumPy, worth it where NumPy is loaded anyway
+    and many spinners are posed per frame, as in the wall.
+    """
+    key = (style, arm_count, arm_length, handle_radius, scale, detail, rings, vectorized)
+    tessellation = _tessellations.get(key)
+    if tessellation is None:
+        shapes = spinner_shapes(style, (0, 0), 0, arm_count, arm_length, handle_radius, scale,
+                                detail, rings)
+        tessellation = _tessellations[key] = Tessellation(shapes, vectorized)
+    return tessellation
+
+def clear_cache():
+    """Forget all tessellations, e.g. to time building them from scratch.
+
+    Every parameter is part of the cache key, so changing the style or arm
+    count doesn't call for this.
+    """
+    _tessellations.clear()
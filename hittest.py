@@ -0,0 +1,121 @@
+"""Uniform-grid spatial index for hit-testing screen regions."""
+
+import math
+
+class SpatialGrid:
+    """Buckets axis-aligned boxes into square cells for O(1) point queries.
+
+    Boxes are (x, y, w, h) in turtle coordinates with (x, y) the lower-left
+    corner. Registering an existing id replaces its box.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.boxes = {}   # id -> (x, y, w, h)
+        self.cells = {}   # (col, row) -> set of ids
+
+    def _cell_range(self, box):
+        x, y, w, h = box
+        size = self.cell_size
+        return (range(math.floor(x / size), math.floor((x + w) / size) + 1),
+                range(math.floor(y / size), math.floor((y + h) / size) + 1))
+
+    def insert(self, region_id, box):
+        """Add or move a box."""
+        if self.boxes.get(region_id) == box:
+            return
+        self.remove(region_id)
+        self.boxes[region_id] = box
+        cols, rows = self._cell_range(box)
+        for col in cols:
+            for row in rows:
+                self.cells.setdefault((col, row), set()).add(region_id)
+
+    def remove(self, region_id):
+        """Drop a box; unknown ids are ignored."""
+        box = self.boxes.pop(region_id, None)
+        if box is None:
+            return
+        cols, rows = self._cell_range(box)
+        for col in cols:
+            for row in rows:
+                bucket = self.cells.get((col, row))
+                if bucket is not None:
+                    bucket.discard(region_id)
+                    if not bucket:
+                        del self.cells[(col, row)]
+
+    def query_point(self, x, y):
+        """Ids of all boxes containing (x, y)."""
+        size = self.cell_size
+        bucket = self.cells.get((math.floor(x / size), math.floor(y / size)), ())
+        hits = []
+        for region_id in bucket:
+            bx, by, bw, bh = self.boxes[region_id]
+            if bx <= x <= bx + bw and by <= y <= by + bh:
+                hits.append(region_id)
+        return hits
+
+    def __len__(self):
+        return len(self.boxes)
+
+class HitTester:
+    """Registered click regions (circles and rectangles) with stacking order.
+
+    Regions are indexed by their bounding box in a SpatialGrid, so hit() only
+    inspects the handful of regions sharing the clicked cell. Higher z wins;
+    ties go to the region registered last.
+    """
+
+    def __init__(self, cell_size=64):
+        self.grid = SpatialGrid(cell_size)
+        self.regions = {}  # id -> (shape, z, order, handler)
+        self._order = 0
+
+    def _add(self, region_id, shape, box, z, handler):
+        # Moving an existing region keeps its place in the stacking order
+        existing = self.regions.get(region_id)
+        if existing is None:
+            self._order += 1
+            order = self._order
+        else:
+            order = existing[2]
+        self.regions[region_id] = (shape, z, order, handler)
+        self.grid.insert(region_id, box)
+
+    def add_rect(self, region_id, x, y, w, h, z=0, handler=None):
+        """Register or move a rectangle with (x, y) its lower-left corner."""
+        self._add(region_id, ('rect', x, y, w, h), (x, y, w, h), z, handler)
+
+    def add_circle(self, region_id, cx, cy, radius, z=0, handler=None):
+        """Register or move a circle."""
+        box = (cx - radius, cy - radius, 2 * radius, 2 * radius)
+        self._add(region_id, ('circle', cx, cy, radius), box, z, handler)
+
+    def remove(self, region_id):
+        """Unregister a region; unknown ids are ignored."""
+        self.regions.pop(region_id, None)
+        self.grid.remove(region_id)
+
+    def hit(self, x, y):
+        """Id of the topmost region containing (x, y), or None."""
+        best = None
+        best_rank = None
+        for region_id in self.grid.query_point(x, y):
+            shape, z, order, _ = self.regions[region_id]
+            if shape[0] == 'circle':
+                _, cx, cy, radius = shape
+                if (x - cx)**2 + (y - cy)**2 > radius**2:
+                    continue
+            if best_rank is None or (z, order) > best_rank:
+                best = region_id
+                best_rank = (z, order)
+        return best
+
+    def handler(self, region_id):
+        """Callback registered for a region, if any."""
+        region = self.regions.get(region_id)
+        return region[3] if region else None
+
+    def __len__(self):
+        return len(self.regions)
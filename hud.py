@@ -0,0 +1,61 @@
+"""Retained HUD canvas items that only touch Tk when what they show changes."""
+
+SPEED_DECIMALS = 2  # Speed readout precision
+ARC_STEP = 2        # Speedometer extent resolution in degrees
+
+def quantize(value, step):
+    """value rounded to a multiple of step."""
+    return round(value / step) * step
+
+class TextItem:
+    """A canvas text item memoized by the value it displays.
+
+    update() takes the raw display value (already quantized to what the
+    text can show). Formatting only runs when that value changes, and the
+    item is only reconfigured, and its font laid out again, when the
+    formatted text differs.
+    """
+
+    __slots__ = ('canvas', 'item', 'formatter', 'value', 'text')
+
+    def __init__(self, canvas, x, y, formatter, value, font, anchor='sw', fill='black'):
+        self.canvas = canvas
+        self.formatter = formatter
+        self.value = value
+        self.text = formatter(value)
+        self.item = canvas.create_text(x, y, text=self.text, anchor=anchor, fill=fill, font=font)
+
+    def update(self, value):
+        """Show value; returns True if the text on screen changed."""
+        if value == self.value:
+            return False
+        self.value = value
+        text = self.formatter(value)
+        if text == self.text:
+            return False
+        self.text = text
+        self.canvas.itemconfig(self.item, text=text)
+        return True
+
+class ArcItem:
+    """A canvas arc item memoized by its box, extent and color."""
+
+    __slots__ = ('canvas', 'item', 'value')
+
+    def __init__(self, canvas, bbox, extent, color, start=0, width=1):
+        self.canvas = canvas
+        self.value = (bbox, extent, color)
+        self.item = canvas.create_arc(*bbox, start=start, extent=extent, style='arc',
+                                      outline=color, width=width)
+
+    def update(self, bbox, extent, color):
+        """Move and restyle the arc; returns True if anything changed."""
+        value = (bbox, extent, color)
+        if value == self.value:
+            return False
+        if bbox != self.value[0]:
+            self.canvas.coords(self.item, *bbox)
+        if (extent, color) != self.value[1:]:
+            self.canvas.itemconfig(self.item, extent=extent, outline=color)
+        self.value = value
+        return True
@@ -0,0 +1,232 @@
+"""Headless spinner rendering into PIL images and clip export without Tk."""
+
+import itertools
+import math
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import GifImagePlugin, Image, ImageChops, ImageDraw
+
+import geometry
+from physics import SpinnerPhysics
+from pyramid import pyramid_for
+
+class OffscreenRenderer:
+    """Draws the classic, tri, gear and image styles into PIL images.
+
+    Coordinates follow turtle: the spinner sits at the image center and y
+    points up. With background=None frames are transparent RGBA sprites.
+    """
+
+    def __init__(self, style='classic', size=400, arm_count=3, arm_length=100,
+                 handle_radius=40, spinner_radius=150, image_path=None,
+                 background=(255, 255, 255), rotation_steps=360):
+        self.style = style
+        self.size = size
+        self.arm_count = arm_count
+        self.arm_length = arm_length
+        self.handle_radius = handle_radius
+        self.spinner_radius = spinner_radius
+        self.background = background
+        self.rotation_steps = rotation_steps
+        self.rotations = {}  # Rotation step -> rotated RGBA sprite
+        self.sprite = None
+        # Without an image the image style tessellates to just the bearing,
+        # the placeholder spinner.py shows while its image loads
+        if style == 'image' and image_path is not None:
+            side = int(spinner_radius * 2)
+            self.sprite = pyramid_for(image_path).resized(side)
+
+    def _rotated_sprite(self, turn):
+        steps = self.rotation_steps
+        step = int(round((turn % 360) * steps / 360)) % steps
+        sprite = self.rotations.get(step)
+        if sprite is None:
+            sprite = self.sprite.rotate(-step * 360 / steps)  # Negative for clockwise rotation
+            self.rotations[step] = sprite
+        return sprite
+
+    def render(self, turn):
+        """Render one frame at the given turn angle."""
+        if self.background is None:
+            frame = Image.new('RGBA', (self.size, self.size), (0, 0, 0, 0))
+        else:
+            frame = Image.new('RGB', (self.size, self.size), self.background)
+        if self.sprite is not None:
+            sprite = self._rotated_sprite(turn)
+            offset = (self.size - sprite.width) // 2
+            frame.paste(sprite, (offset, offset), sprite)
+            return frame
+
+        draw = ImageDraw.Draw(frame)
+        tessellation = geometry.tessellate(self.style, self.arm_count,
+                                           self.arm_length, self.handle_radius)
+        # Placing at (half, -half) and flipping y lands the center mid-image
+        half = self.size / 2
+        coords = tessellation.placed(turn, (half, -half), flip_y=True)
+        for (kind, fill, outline, width), xy in zip(tessellation.styles, coords):
+            if kind == 'line':
+                draw.line(xy, fill=outline, width=int(round(width)))
+            else:
+                draw.polygon(xy, fill=fill or None, outline=outline, width=int(round(width)))
+        return frame
+
+def spin_down_turns(v0=20.0, inertia=0.995, duration=10.0, fps=60, turn=0.0):
+    """Turn angle of every output frame, sampled from the fixed-step physics."""
+    physics = SpinnerPhysics(turn=turn, angular_velocity=v0, inertia=inertia)
+    turns = []
+    for _ in range(int(round(duration * fps))):
+        turns.append(physics.turn)
+        physics.advance(1 / fps)
+    return turns
+
+# Pillow's WebP writer needs every frame up front, so a WebP clip is held in
+# memory in full; past this many bytes of raw frames export_clip() refuses
+WEBP_MEMORY_LIMIT = 1 << 30
+
+def ordered_frames(turns, render, workers, queue_size=32):
+    """Yield render(index, turn) for every turn, in order.
+
+    A pool of worker threads renders ahead of the consumer, and frames that
+    finish early wait in a reorder buffer. At most queue_size frames are
+    queued, rendering or waiting to be taken at any time, so memory stays
+    bounded however long the clip is.
+    """
+    jobs = iter(enumerate(turns))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque(pool.submit(render, index, turn)
+                        for index, turn in itertools.islice(jobs, queue_size))
+        try:
+            while pending:
+                frame = pending.popleft().result()
+                for index, turn in itertools.islice(jobs, 1):
+                    pending.append(pool.submit(render, index, turn))
+                yield frame
+        finally:
+            for future in pending:
+                future.cancel()
+
+def gif_turns(turns, fps):
+    """Resample turns to a frame rate GIF can express; returns (turns, delay in ms).
+
+    GIF delays are whole centiseconds, and browsers slow delays of 1 cs or
+    less down to 10 cs, so a GIF runs at 50 fps at most. Clips are resampled
+    to the shortest whole-centisecond delay no faster than fps (2 cs for
+    60 fps, 4 cs for 30 fps), keeping the frame nearest each tick.
+    """
+    delay = max(2, math.ceil(100 / fps))  # Centiseconds
+    stride = delay * fps / 100             # Source frames per GIF frame
+    count = math.ceil(len(turns) / stride)
+    return [turns[min(round(k * stride), len(turns) - 1)] for k in range(count)], delay * 10
+
+def write_gif(path, frames, duration):
+    """Stream P mode frames that share one palette into an animated GIF.
+
+    duration is each frame's delay in milliseconds, a multiple of 10. Each
+    frame is written as its difference from the previous one, and a frame
+    identical to the previous one only extends its duration, so just one
+    frame is held back at a time.
+    """
+    previous = None
+    held = None  # (cropped frame, offset, duration) not written yet
+    with open(path, 'wb') as fp:
+        for frame in frames:
+            if previous is None:
+                header, _ = GifImagePlugin.getheader(frame, info={'loop': 0, 'duration': duration})
+                fp.writelines(header)
+                box = (0, 0) + frame.size
+            else:
+                # Palette indices compared as grayscale; the palette is shared
+                box = ImageChops.difference(previous.convert('L'), frame.convert('L')).getbbox()
+            previous = frame
+            if box is None:
+                held[2] += duration
+                continue
+            if held is not None:
+                fp.writelines(GifImagePlugin.getdata(held[0], offset=held[1], duration=held[2]))
+            held = [frame.crop(box), box[:2], duration]
+        if held is not None:
+            fp.writelines(GifImagePlugin.getdata(held[0], offset=held[1], duration=held[2]))
+        fp.write(b';')  # Trailer
+
+def export_clip(path, turns, renderer, fps=60, workers=None, queue_size=32):
+    """Render turns with a worker pool and write them to path.
+
+    '.gif' and '.webp' paths produce an animated image; any other path is a
+    directory that receives a numbered PNG sequence. PNG and GIF frames are
+    written in order as they finish, with at most queue_size frames in
+    memory. WebP clips are encoded in one go once every frame is rendered,
+    and raise ValueError if their frames would exceed WEBP_MEMORY_LIMIT.
+
+    GIF delays are whole centiseconds of at least 2, so GIF clips are
+    resampled to a rate it can express (see gif_turns()), keeping their
+    duration.
+    Returns the number of frames written.
+    """
+    lower = path.lower()
+    workers = workers or os.cpu_count() or 1
+    if lower.endswith('.webp'):
+        if not turns:
+            return 0
+        # renderer only has to provide render(), so the first frame tells
+        # how large every frame is
+        first = renderer.render(turns[0])
+        frame_bytes = first.width * first.height * len(first.getbands())
+        if len(turns) * frame_bytes > WEBP_MEMORY_LIMIT:
+            raise ValueError(f"{len(turns)} frames of {first.width}x{first.height}px are too "
+                             "many to hold for WebP; export a GIF or a PNG sequence instead")
+        frames = list(ordered_frames(turns[1:], lambda index, turn: renderer.render(turn),
+                                     workers, queue_size))
+        first.save(path, save_all=True, append_images=frames,
+                   duration=round(1000 / fps), loop=0)
+    elif lower.endswith('.gif'):
+        if not turns:
+            return 0
+        turns, duration = gif_turns(turns, fps)
+        # Every style uses a fixed set of colors, so one shared palette fits
+        # the whole clip and avoids per-frame palette search and flicker
+        palette = renderer.render(turns[0]).quantize()
+
+        def render(index, turn):
+            return renderer.render(turn).quantize(palette=palette)
+
+        write_gif(path, ordered_frames(turns, render, workers, queue_size), duration)
+    else:
+        os.makedirs(path, exist_ok=True)
+
+        def render(index, turn):
+            renderer.render(turn).save(os.path.join(path, f"frame_{index:05d}.png"))
+
+        for _ in ordered_frames(turns, render, workers, queue_size):
+            pass
+    return len(turns)
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Render a spin-down clip without a display")
+    parser.add_argument('output', help="output .gif/.webp file, or a directory for PNG frames")
+    parser.add_argument('--style', default='classic', choices=['classic', 'tri', 'gear', 'image'])
+    parser.add_argument('--image', help="sprite for the image style")
+    parser.add_argument('--arms', type=int, default=3)
+    parser.add_argument('--speed', type=float, default=20.0, help="initial angular velocity")
+    parser.add_argument('--inertia', type=float, default=0.995)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--fps', type=int, default=60)
+    parser.add_argument('--size', type=int, default=400)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    image_path = args.image
+    if args.style == 'image' and image_path is None:
+        image_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "spinner.png")
+
+    start = time.perf_counter()
+    renderer = OffscreenRenderer(style=args.style, size=args.size, arm_count=args.arms,
+                                 image_path=image_path)
+    turns = spin_down_turns(args.speed, args.inertia, args.duration, args.fps)
+    count = export_clip(args.output, turns, renderer, fps=args.fps, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"Rendered {count} frames in {elapsed:.2f}s ({count / elapsed:.0f} fps)")
@@ -0,0 +1,51 @@
+"""Frame pacing on the monotonic performance counter."""
+
+import time
+
+perf_counter = time.perf_counter
+
+FRAME_RATES = (30, 60, 120, 144)
+
+class FramePacer:
+    """Schedules frames against absolute deadlines one period apart.
+
+    Tk timers take whole milliseconds and fire late by a varying amount.
+    Aiming each delay at the next deadline, instead of waiting a fixed
+    16 ms, absorbs the frame's own work, the timer's lateness and the
+    rounding, so the average rate stays on target. A loop that falls more
+    than a period behind resynchronizes rather than bursting to catch up.
+    """
+
+    def __init__(self, fps=60):
+        self.set_rate(fps)
+        self.last_tick = None  # perf_counter() at the start of the last frame
+        self.deadline = None   # When the last scheduled frame was due
+
+    def set_rate(self, fps):
+        """Change the target frame rate."""
+        self.fps = fps
+        self.period = 1 / fps
+
+    def start(self):
+        """Begin pacing from now, e.g. when the loop wakes from idle."""
+        now = perf_counter()
+        self.last_tick = now
+        self.deadline = now
+
+    def tick(self):
+        """Call at the start of a frame; returns seconds since the previous one."""
+        now = perf_counter()
+        if self.last_tick is None:
+            self.start()
+            return 0.0
+        elapsed = now - self.last_tick
+        self.last_tick = now
+        return elapsed
+
+    def delay(self):
+        """Call at the end of a frame; returns milliseconds until the next one."""
+        now = perf_counter()
+        self.deadline += self.period
+        if self.deadline < now - self.period:
+            self.deadline = now
+        return max(0, round((self.deadline - now) * 1000))
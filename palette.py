@@ -0,0 +1,46 @@
+"""Precomputed background color transitions."""
+
+def color_hex(color):
+    """Tk color string for an (r, g, b) tuple of 0-1 floats."""
+    return "#%02x%02x%02x" % tuple(int(round(min(max(c, 0.0), 1.0) * 255)) for c in color)
+
+def speed_steps(base_step, levels=64):
+    """Lerp step for each quantized speed factor level (0 to 1)."""
+    return [base_step * (i / (levels - 1)) * 5 for i in range(levels)]
+
+class ColorTransition:
+    """Lerp path from one color to a target, precomputed as a lookup table.
+
+    Repeatedly lerping toward a fixed target only moves along the line from
+    start to target, so a transition is fully described by its progress.
+    Each update advances progress and reads a ready Tk color string.
+    """
+
+    def __init__(self, start, target, resolution=256, tolerance=0.01):
+        self.start = start
+        self.target = target
+        self.progress = 0.0
+        self.resolution = resolution
+        self.lut = [color_hex(self._at(i / resolution)) for i in range(resolution + 1)]
+
+        # Done once every channel is within tolerance of the target
+        distance = max(abs(b - a) for a, b in zip(start, target))
+        self.done_at = 1 - tolerance / distance if distance >= tolerance else 0.0
+
+    def _at(self, progress):
+        return tuple(a + (b - a) * progress for a, b in zip(self.start, self.target))
+
+    def advance(self, step):
+        """Equivalent of lerping the current color toward the target by step."""
+        self.progress += (1 - self.progress) * step
+
+    def color(self):
+        """Current color as an (r, g, b) float tuple."""
+        return self._at(self.progress)
+
+    def color_string(self):
+        """Current color quantized to the lookup table."""
+        return self.lut[int(self.progress * self.resolution)]
+
+    def done(self):
+        return self.progress >= self.done_at
@@ -0,0 +1,202 @@
+"""Headless spin physics, independent of turtle and the Tk event loop."""
+
+import math
+
+TIMESTEP = 1 / 60          # Fixed physics step (seconds)
+STOP_THRESHOLD = 0.001     # Below this angular velocity the spinner stops
+MAX_FRAME_TIME = 0.1       # Cap on elapsed time fed to the driver per call
+
+class SpinnerPhysics:
+    """Fixed-timestep spinner integrator.
+
+    Angular velocity is in degrees per 1/60 s tick, so one step at the
+    default timestep adds angular_velocity to turn and multiplies it by
+    inertia.
+    """
+
+    def __init__(self, turn=0.0, angular_velocity=0.0, inertia=0.995,
+                 timestep=TIMESTEP, stop_threshold=STOP_THRESHOLD,
+                 max_frame_time=MAX_FRAME_TIME):
+        self.turn: float = turn
+        self.angular_velocity: float = angular_velocity
+        self.inertia: float = inertia
+        self.timestep: float = timestep
+        self.stop_threshold: float = stop_threshold
+        self.max_frame_time: float = max_frame_time
+        self.accumulator: float = 0.0  # Unsimulated time left over by advance()
+
+    def is_spinning(self):
+        """True while the spinner is above the stop threshold."""
+        return abs(self.angular_velocity) > self.stop_threshold
+
+    def step(self, n=1):
+        """Advance up to n fixed timesteps.
+
+        Stops early once the spinner comes to rest. Returns the number of
+        steps actually integrated.
+        """
+        scale = self.timestep * 60  # Scale by 60 to keep per-tick units
+        decay = pow(self.inertia, scale)
+        threshold = self.stop_threshold
+        turn = self.turn
+        velocity = self.angular_velocity
+        steps = 0
+        for _ in range(n):
+            if abs(velocity) <= threshold:
+                velocity = 0
+                break
+            turn += velocity * scale
+            velocity *= decay
+            steps += 1
+        self.turn = turn
+        self.angular_velocity = velocity
+        return steps
+
+    def advance(self, elapsed):
+        """Variable-rate driver: consume wall time in fixed steps.
+
+        Leftover time stays in the accumulator for the next call. Returns the
+        number of steps taken.
+        """
+        self.accumulator += min(max(elapsed, 0.0), self.max_frame_time)
+        steps = int(self.accumulator / self.timestep)
+        if steps:
+            self.step(steps)
+            self.accumulator -= steps * self.timestep
+        return steps
+
+    def alpha(self):
+        """Fraction of a step held in the accumulator, for interpolation."""
+        return self.accumulator / self.timestep
+
+    def interpolated_turn(self):
+        """Turn between this step and the next, alpha of the way along.
+
+        Without input the next step is fully determined, so rendering this
+        instead of turn shows smooth motion when frames outpace the physics.
+        """
+        if not self.is_spinning():
+            return self.turn
+        return self.turn + self.angular_velocity * self.timestep * 60 * self.alpha()
+
+    def reset(self, inertia=0.995):
+        """Stop the spinner and return it to angle zero."""
+        self.turn = 0.0
+        self.angular_velocity = 0.0
+        self.inertia = inertia
+        self.accumulator = 0.0
+
+
+# Closed-form spin-down. Each step moves the spinner by v * s and multiplies
+# v by d, with s = timestep * 60 and d = inertia ** s, so after k steps
+# v_k = v0 * d**k and the turn has advanced by v0 * s * (1 - d**k) / (1 - d).
+
+def steps_to_stop(v0, inertia, threshold=STOP_THRESHOLD, timestep=TIMESTEP):
+    """Number of steps a spin starting at v0 moves before it stops."""
+    speed = abs(v0)
+    if speed <= threshold:
+        return 0
+    decay = pow(inertia, timestep * 60)
+    if decay >= 1:
+        return math.inf
+    if decay <= 0:
+        return 1
+    n = max(math.ceil(math.log(threshold / speed) / math.log(decay)), 1)
+    # Guard against rounding right at a step boundary
+    if speed * pow(decay, n - 1) <= threshold:
+        n -= 1
+    elif speed * pow(decay, n) > threshold:
+        n += 1
+    return n
+
+def time_to_stop(v0, inertia, threshold=STOP_THRESHOLD, timestep=TIMESTEP):
+    """Seconds until a spin starting at v0 stops."""
+    return steps_to_stop(v0, inertia, threshold, timestep) * timestep
+
+def _rotation_after(v0, decay, scale, k):
+    """Rotation accumulated over the first k steps."""
+    if k == 0:
+        return 0.0
+    if decay == 1:
+        return v0 * scale * k
+    return v0 * scale * (1 - pow(decay, k)) / (1 - decay)
+
+def final_angle(v0, inertia, turn=0.0, threshold=STOP_THRESHOLD, timestep=TIMESTEP):
+    """Angle the spinner comes to rest at."""
+    n = steps_to_stop(v0, inertia, threshold, timestep)
+    if n == math.inf:
+        return math.copysign(math.inf, v0)
+    scale = timestep * 60
+    return turn + _rotation_after(v0, pow(inertia, scale), scale, n)
+
+def angle_at(t, v0, inertia, turn=0.0, threshold=STOP_THRESHOLD, timestep=TIMESTEP):
+    """Angle after t seconds of free spin (whole steps only)."""
+    k = min(int(t / timestep + 1e-9), steps_to_stop(v0, inertia, threshold, timestep))
+    scale = timestep * 60
+    return turn + _rotation_after(v0, pow(inertia, scale), scale, k)
+
+def velocity_at(t, v0, inertia, threshold=STOP_THRESHOLD, timestep=TIMESTEP):
+    """Angular velocity after t seconds of free spin."""
+    k = int(t / timestep + 1e-9)
+    if k >= steps_to_stop(v0, inertia, threshold, timestep):
+        return 0.0
+    return v0 * pow(inertia, timestep * 60 * k)
+
+def batch_numpy():
+    """Import NumPy for the batch functions.
+
+    Deferred to the first batch call, so importing this module (which
+    spinner.py does at startup) stays cheap.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("NumPy is required for batch simulation") from None
+    return numpy
+
+def batch_spin_down(v0, inertia, threshold=STOP_THRESHOLD, timestep=TIMESTEP):
+    """Vectorized spin-down for arrays of (v0, inertia) pairs.
+
+    Inputs broadcast against each other. Returns a dict of arrays with
+    'steps', 'time_to_stop', 'total_rotation' and 'peak_speed'; spins that
+    never stop get inf.
+    """
+    np = batch_numpy()
+    v0, inertia = np.broadcast_arrays(np.asarray(v0, dtype=float),
+                                      np.asarray(inertia, dtype=float))
+    scale = timestep * 60
+    speed = np.abs(v0)
+    decay = np.power(inertia, scale)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        n = np.ceil(np.log(threshold / speed) / np.log(decay))
+        n = np.maximum(n, 1)
+        # Same boundary correction as steps_to_stop()
+        n = np.where(speed * np.power(decay, n - 1) <= threshold, n - 1, n)
+        n = np.where(speed * np.power(decay, n) > threshold, n + 1, n)
+        n = np.where(decay <= 0, 1, n)
+        n = np.where(decay >= 1, np.inf, n)
+        n = np.where(speed <= threshold, 0, n)
+
+        geometric = (1 - np.power(decay, n)) / (1 - decay)
+        rotation = v0 * scale * np.where(np.isinf(n), np.inf, geometric)
+        rotation = np.where(n == 0, 0.0, rotation)
+
+    return {
+        'steps': n,
+        'time_to_stop': n * timestep,
+        'total_rotation': rotation,
+        'peak_speed': np.where(n == 0, 0.0, speed),
+    }
+
+def batch_angle_at(t, v0, inertia, turn=0.0, threshold=STOP_THRESHOLD, timestep=TIMESTEP):
+    """Vectorized angle_at() over broadcastable arrays."""
+    np = batch_numpy()
+    v0 = np.asarray(v0, dtype=float)
+    scale = timestep * 60
+    decay = np.power(np.asarray(inertia, dtype=float), scale)
+    n = batch_spin_down(v0, inertia, threshold, timestep)['steps']
+    k = np.minimum(np.floor(np.asarray(t, dtype=float) / timestep + 1e-9), n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        geometric = np.where(decay == 1, k, (1 - np.power(decay, k)) / (1 - decay))
+    return turn + np.where(k == 0, 0.0, v0 * scale * geometric)
@@ -0,0 +1,78 @@
+"""Ring buffer of timestamped pointer samples fed by Tk motion events."""
+
+import math
+from collections import deque
+
+class PointerTracker:
+    """Collects pointer samples between frames.
+
+    Event handlers push() samples as they arrive; the animation loop calls
+    take() once per frame and only sees the newest one, so any number of
+    motion events costs one drag update.
+    """
+
+    def __init__(self, capacity=64):
+        self.samples = deque(maxlen=capacity)  # (time, x, y), oldest first
+        self.pushed = 0    # Samples pushed so far
+        self.taken = 0     # Value of pushed at the last take()
+
+    def push(self, t, x, y):
+        """Record a pointer position at time t (seconds)."""
+        self.samples.append((t, x, y))
+        self.pushed += 1
+
+    def clear(self):
+        """Forget all samples (a new drag is starting)."""
+        self.samples.clear()
+        self.taken = self.pushed
+
+    def latest(self):
+        """Most recent sample, or None."""
+        return self.samples[-1] if self.samples else None
+
+    def take(self):
+        """Newest sample if any arrived since the last take(), else None."""
+        if self.taken == self.pushed or not self.samples:
+            return None
+        self.taken = self.pushed
+        return self.samples[-1]
+
+    def angular_velocity(self, cx, cy, now=None, window=0.1):
+        """Least-squares angular velocity (degrees/second) around (cx, cy).
+
+        Uses the samples from the window seconds up to now, the time of the
+        release (the newest sample's time if not given). Returns None when
+        there are too few samples to fit a line, and 0.0 when the pointer
+        was held still for the whole window.
+        """
+        if len(self.samples) < 2:
+            return None
+        if now is None:
+            now = self.samples[-1][0]
+        recent = [s for s in self.samples if 0 <= now - s[0] <= window]
+        if len(recent) < 2:
+            return 0.0
+
+        # Unwrap angles so crossing +/-180 degrees doesn't look like a jump
+        times = []
+        angles = []
+        previous = None
+        offset = 0.0
+        for t, x, y in recent:
+            angle = math.degrees(math.atan2(y - cy, x - cx))
+            if previous is not None:
+                diff = angle - previous
+                if diff > 180:
+                    offset -= 360
+                elif diff < -180:
+                    offset += 360
+            previous = angle
+            times.append(t)
+            angles.append(angle + offset)
+
+        mean_t = sum(times) / len(times)
+        mean_a = sum(angles) / len(angles)
+        var_t = sum((t - mean_t) ** 2 for t in times)
+        if var_t == 0:
+            return None
+        return sum((t - mean_t) * (a - mean_a) for t, a in zip(times, angles)) / var_t
@@ -0,0 +1,105 @@
+"""Worker threads that rotate image frames ahead of the spinner.
+
+The Tk thread publishes the spinner's motion once per frame. Workers
+extrapolate it with the closed-form spin-down from physics.py, quantize the
+predicted turns to rotation steps and render any step not already in a
+shared ring, so the Tk thread only has to pick a ready frame up. Motion
+published with a blur level has the workers render blurred frames instead.
+"""
+
+import threading
+
+from physics import angle_at
+
+class FrameRing:
+    """Direct-mapped ring of rendered frames; step s lives in slot s % size.
+
+    A slot holds one (generation, step, level, frame) tuple. Writers replace
+    a whole tuple and readers read one, both single operations under the
+    GIL, so neither side takes a lock.
+    """
+
+    def __init__(self, size=32):
+        self.size = size
+        self.slots = [None] * size
+
+    def put(self, generation, step, frame, level=None):
+        self.slots[step % self.size] = (generation, step, level, frame)
+
+    def get(self, generation, step, level=None):
+        """Frame for step at a blur level from the given generation, or None."""
+        entry = self.slots[step % self.size]
+        if entry is not None and entry[:3] == (generation, step, level):
+            return entry[3]
+        return None
+
+class FramePredictor:
+    """Pre-renders the rotation steps the spinner is about to show.
+
+    render(step, level) runs on the worker threads, so it must not touch
+    Tk; level is the blur level published with the motion, None for crisp
+    frames. quantize(turn) maps a turn angle to its rotation step.
+    """
+
+    def __init__(self, render, quantize, workers=1, ring_size=32, frame_time=1 / 60,
+                 lookahead=12):
+        self.quantize = quantize
+        self.ring = FrameRing(ring_size)
+        self.frame_time = frame_time
+        self.lookahead = lookahead     # Frames predicted ahead of the current one
+        self.generation = 0
+        self.render = render
+        self.motion = None             # (generation, render, turn, velocity, inertia, level)
+        self.running = True
+        self.wakeup = threading.Event()
+        self.threads = [threading.Thread(target=self._work, args=(i, workers), daemon=True)
+                        for i in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def set_source(self, render):
+        """Render frames with a new function; frames from the old one are ignored."""
+        self.render = render
+        self.generation += 1
+
+    def publish(self, turn, velocity, inertia, level=None):
+        """Tell the workers where the spinner is, how it's moving and how blurred."""
+        self.motion = (self.generation, self.render, turn, velocity, inertia, level)
+        self.wakeup.set()
+
+    def get(self, step, level=None):
+        """Ready frame for step at a blur level, or None."""
+        return self.ring.get(self.generation, step, level)
+
+    def close(self):
+        """Stop the workers once they finish the frame they are rendering."""
+        self.running = False
+        self.wakeup.set()
+
+    def predicted_steps(self, turn, velocity, inertia):
+        """Distinct upcoming rotation steps, soonest first."""
+        steps = []
+        for k in range(self.lookahead + 1):
+            step = self.quantize(angle_at(k * self.frame_time, velocity, inertia, turn))
+            if step not in steps:
+                steps.append(step)
+                # Past half the ring, new frames would evict ones still ahead
+                if len(steps) >= self.ring.size // 2:
+                    break
+        return steps
+
+    def _work(self, index, count):
+        while True:
+            self.wakeup.wait()
+            if not self.running:
+                return
+            motion = self.motion
+            generation, render, turn, velocity, inertia, level = motion
+            # Workers split the predicted steps between them
+            for step in self.predicted_steps(turn, velocity, inertia)[index::count]:
+                if self.motion is not motion or not self.running:
+                    break  # Newer motion arrived (predict again) or closed
+                if self.ring.get(generation, step, level) is None:
+                    self.ring.put(generation, step, render(step, level), level)
+            if self.motion is motion and self.running:
+                self.wakeup.clear()
@@ -0,0 +1,174 @@
+"""Low-overhead per-stage frame profiler with percentile stats and trace export."""
+
+import csv
+import functools
+import json
+import time
+from collections import deque
+
+perf_counter = time.perf_counter
+
+class _NullStage:
+    """Shared no-op context manager handed out while profiling is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_STAGE = _NullStage()
+
+class _Stage:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, perf_counter() - self.start)
+        return False
+
+class FrameProfiler:
+    """Collects frame and stage timings while enabled.
+
+    Disabled, stage() returns a shared no-op context and timed() wrappers
+    make a single attribute check before calling through.
+    """
+
+    def __init__(self, target_frame_time=1 / 60, window=600, max_trace=100000):
+        self.enabled = False
+        self.target_frame_time = target_frame_time
+        self.window = window          # Frames kept for rolling statistics
+        self.max_trace = max_trace    # Frames kept for export
+        self.reset()
+
+    def reset(self):
+        """Drop all collected timings."""
+        self.frames = 0
+        self.dropped_frames = 0
+        self.frame_times = deque(maxlen=self.window)
+        self.intervals = deque(maxlen=self.window)
+        self.stage_times = {}
+        self.trace = []
+        self._origin = perf_counter()
+        self._frame_start = None
+        self._last_start = None
+        self._current = {}
+
+    def stage(self, name):
+        """Context manager timing one stage of the current frame."""
+        if not self.enabled:
+            return NULL_STAGE
+        return _Stage(self, name)
+
+    def timed(self, name):
+        """Decorator timing every call of a function as a stage."""
+        def decorate(fun):
+            @functools.wraps(fun)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fun(*args, **kwargs)
+                start = perf_counter()
+                try:
+                    return fun(*args, **kwargs)
+                finally:
+                    self.record(name, perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def record(self, name, seconds):
+        """Add time to a stage of the current frame."""
+        self._current[name] = self._current.get(name, 0.0) + seconds
+
+    def begin_frame(self):
+        """Mark the start of a frame."""
+        if not self.enabled:
+            return
+        now = perf_counter()
+        if self._last_start is not None:
+            interval = now - self._last_start
+            self.intervals.append(interval)
+            # Whole target periods skipped since the previous frame
+            missed = int(interval / self.target_frame_time + 0.5) - 1
+            if missed > 0:
+                self.dropped_frames += missed
+        self._last_start = now
+        self._frame_start = now
+        self._current = {}
+
+    def end_frame(self):
+        """Mark the end of a frame and fold its stages into the stats."""
+        if not self.enabled or self._frame_start is None:
+            return
+        frame_time = perf_counter() - self._frame_start
+        self.frames += 1
+        self.frame_times.append(frame_time)
+        for name, seconds in self._current.items():
+            times = self.stage_times.get(name)
+            if times is None:
+                times = self.stage_times[name] = deque(maxlen=self.window)
+            times.append(seconds)
+        if len(self.trace) < self.max_trace:
+            record = {'time': self._frame_start - self._origin, 'frame': frame_time}
+            record.update(self._current)
+            self.trace.append(record)
+        self._frame_start = None
+
+    def mark_idle(self):
+        """The loop is going to sleep; don't count the gap as dropped frames."""
+        self._last_start = None
+
+    @staticmethod
+    def percentiles(values):
+        """p50/p95/p99 of a sequence of seconds, in milliseconds."""
+        if not values:
+            return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+        ordered = sorted(values)
+        last = len(ordered) - 1
+        return {f'p{p}': ordered[min(last, int(len(ordered) * p / 100))] * 1000
+                for p in (50, 95, 99)}
+
+    def summary(self):
+        """Rolling statistics for the frame and every stage."""
+        return {
+            'frames': self.frames,
+            'dropped_frames': self.dropped_frames,
+            'frame_ms': self.percentiles(self.frame_times),
+            'interval_ms': self.percentiles(self.intervals),
+            'stages_ms': {name: self.percentiles(times)
+                          for name, times in self.stage_times.items()},
+        }
+
+    def hud_text(self):
+        """Compact multi-line summary for an on-screen overlay."""
+        stats = self.summary()
+        frame = stats['frame_ms']
+        lines = [
+            f"frame p50 {frame['p50']:.2f}  p95 {frame['p95']:.2f}  p99 {frame['p99']:.2f} ms",
+            f"dropped {stats['dropped_frames']} / {stats['frames']}",
+        ]
+        for name, stage in sorted(stats['stages_ms'].items()):
+            lines.append(f"{name}: {stage['p50']:.2f} / {stage['p95']:.2f} ms")
+        return "\n".join(lines)
+
+    def export(self, path):
+        """Write the per-frame trace as CSV (by extension) or JSON."""
+        if path.endswith('.csv'):
+            stages = sorted({name for record in self.trace for name in record}
+                            - {'time', 'frame'})
+            with open(path, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=['time', 'frame'] + stages)
+                writer.writeheader()
+                writer.writerows(self.trace)
+        else:
+            with open(path, 'w') as f:
+                json.dump({'summary': self.summary(), 'trace': self.trace}, f, indent=1)
+
+# Shared profiler for the application
+profiler = FrameProfiler()
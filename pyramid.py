@@ -0,0 +1,60 @@
+"""Power-of-two image pyramids for drawing one sprite at many sizes."""
+
+import os
+import threading
+
+from PIL import Image
+
+class ImagePyramid:
+    """Mip levels of a square sprite, each half the size of the one before.
+
+    Level 0 is the source image made square; the smaller levels are box
+    filtered down from it once. Any size is then a cheap bilinear resize of
+    the smallest level at least that big, which never shrinks by more than
+    half, so no further LANCZOS pass over the full-size source is needed.
+    """
+
+    def __init__(self, image, min_size=16):
+        side = max(image.size)
+        if image.size != (side, side):
+            # Spinner sprites are square; stretch once like the old loader did
+            image = image.resize((side, side), Image.Resampling.LANCZOS)
+        image.load()
+        self.levels = [image]
+        while self.levels[-1].width // 2 >= min_size:
+            # Premultiplied, so transparent pixels don't bleed into the edges
+            self.levels.append(self.levels[-1].convert('RGBa').reduce(2).convert('RGBA'))
+
+    def level_for(self, size):
+        """Smallest level with a side of at least size (level 0 if none is)."""
+        for level in reversed(self.levels):
+            if level.width >= size:
+                return level
+        return self.levels[0]
+
+    def resized(self, size):
+        """The sprite at size x size."""
+        level = self.level_for(size)
+        if level.width == size:
+            return level.copy()
+        return level.resize((size, size), Image.Resampling.BILINEAR)
+
+# Pyramids by (path, modification time, file size), shared by every spinner
+_pyramids = {}
+_lock = threading.Lock()  # Images can be loaded from worker threads
+
+def pyramid_for(path):
+    """Cached ImagePyramid for an image file, built on first use."""
+    info = os.stat(path)
+    key = (os.path.abspath(path), info.st_mtime_ns, info.st_size)
+    with _lock:
+        pyramid = _pyramids.get(key)
+        if pyramid is None:
+            with Image.open(path) as source:
+                pyramid = _pyramids[key] = ImagePyramid(source.convert('RGBA'))
+        return pyramid
+
+def clear_cache():
+    """Forget all pyramids."""
+    with _lock:
+        _pyramids.clear()
@@ -0,0 +1,66 @@
+"""Adaptive rendering quality driven by measured frame cost."""
+
+# Detail levels from full quality down. detail scales circle segment counts,
+# rings keeps the classic arms' decorative rings, rotation_stride uses every
+# n-th cached image rotation step and background keeps the color effect.
+LEVELS = [
+    {'detail': 1.0, 'rings': True, 'rotation_stride': 1, 'background': True},
+    {'detail': 0.6, 'rings': True, 'rotation_stride': 1, 'background': True},
+    {'detail': 0.6, 'rings': False, 'rotation_stride': 2, 'background': True},
+    {'detail': 0.4, 'rings': False, 'rotation_stride': 3, 'background': False},
+]
+
+class QualityController:
+    """Steps the quality level down under load and back up with headroom.
+
+    Each frame reports how long it took to produce. The level drops when the
+    smoothed cost stays above high_water of the frame budget for
+    degrade_frames frames, and rises only after it stays below low_water for
+    restore_frames frames. The gap between the two thresholds and the longer
+    restore window keep the level from flapping, and the counters restart
+    after every change so its effect is measured before the next one.
+    """
+
+    def __init__(self, target_frame_time=1 / 60, high_water=0.75, low_water=0.35,
+                 degrade_frames=20, restore_frames=180, smoothing=0.1):
+        self.target_frame_time = target_frame_time
+        self.high_water = high_water
+        self.low_water = low_water
+        self.degrade_frames = degrade_frames
+        self.restore_frames = restore_frames
+        self.smoothing = smoothing
+        self.level = 0
+        self.cost = None   # Exponential moving average of frame cost (seconds)
+        self.over = 0      # Consecutive frames above high_water
+        self.under = 0     # Consecutive frames below low_water
+
+    def settings(self):
+        """Rendering settings for the current level."""
+        return LEVELS[self.level]
+
+    def update(self, frame_cost):
+        """Fold in one frame's cost. Returns True if the level changed."""
+        if self.cost is None:
+            self.cost = frame_cost
+        else:
+            self.cost += (frame_cost - self.cost) * self.smoothing
+        load = self.cost / self.target_frame_time
+
+        self.over = self.over + 1 if load > self.high_water else 0
+        self.under = self.under + 1 if load < self.low_water else 0
+        if self.over >= self.degrade_frames and self.level < len(LEVELS) - 1:
+            self.level += 1
+        elif self.under >= self.restore_frames and self.level > 0:
+            self.level -= 1
+        else:
+            return False
+        self.over = 0
+        self.under = 0
+        return True
+
+    def reset(self):
+        """Back to full quality with no history."""
+        self.level = 0
+        self.cost = None
+        self.over = 0
+        self.under = 0
@@ -0,0 +1,170 @@
+"""Binary session recording and deterministic headless replay.
+
+A session file is a header (magic, version, RNG seed) followed by records,
+each a one-byte type and a fixed-size little-endian payload:
+
+    FRAME   elapsed seconds fed to the frame (f64)
+    KEY     index into spinner.KEYS (u8)
+    CLICK   x, y (f64), button state (u8), event time in seconds (f64, releases only)
+    MOTION  event time in seconds, x, y (f64)
+    IMAGE   spinner image loaded: path length (u16) then UTF-8 path
+"""
+
+import struct
+import sys
+import time
+
+MAGIC = b'SPNR'
+VERSION = 2  # 2 added the event time to CLICK
+
+FRAME, KEY, CLICK, MOTION, IMAGE = 1, 2, 3, 4, 5
+
+_HEADER = struct.Struct('<4sBQ')
+_PAYLOADS = {
+    FRAME: struct.Struct('<d'),
+    KEY: struct.Struct('<B'),
+    CLICK: struct.Struct('<ddBd'),
+    MOTION: struct.Struct('<ddd'),
+    IMAGE: struct.Struct('<H'),
+}
+
+class SessionRecorder:
+    """Appends input events and frame times to a session file.
+
+    keys is the ordered tuple of key names; a key is recorded as its index.
+    """
+
+    def __init__(self, path, seed, keys):
+        self.keys = keys
+        self.file = open(path, 'wb')
+        self.file.write(_HEADER.pack(MAGIC, VERSION, seed))
+
+    def _write(self, kind, *values):
+        self.file.write(bytes((kind,)) + _PAYLOADS[kind].pack(*values))
+
+    def frame(self, elapsed):
+        self._write(FRAME, elapsed)
+
+    def key(self, name):
+        self._write(KEY, self.keys.index(name))
+
+    def click(self, x, y, button_state, t):
+        self._write(CLICK, x, y, button_state, t)
+
+    def motion(self, t, x, y):
+        self._write(MOTION, t, x, y)
+
+    def image(self, path):
+        encoded = path.encode('utf-8')
+        self._write(IMAGE, len(encoded))
+        self.file.write(encoded)
+
+    def close(self):
+        self.file.close()
+
+def read_session(path):
+    """Return (seed, events) where events are (kind, *payload) tuples."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, seed = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Not a spinner session file: {path}")
+    if version != VERSION:
+        raise ValueError(f"Session file version {version} is not supported "
+                         f"(expected {VERSION}): {path}")
+    events = []
+    offset = _HEADER.size
+    while offset < len(data):
+        kind = data[offset]
+        payload = _PAYLOADS[kind]
+        values = payload.unpack_from(data, offset + 1)
+        offset += 1 + payload.size
+        if kind == IMAGE:
+            # Variable-length path follows the length prefix
+            values = (data[offset:offset + values[0]].decode('utf-8'),)
+            offset += len(values[0].encode('utf-8'))
+        events.append((kind,) + values)
+    return seed, events
+
+def replay_session(path, on_frame=None):
+    """Drive spinner.py from a session file with no display.
+
+    Physics, input handling and the background effect run exactly as they
+    did live, as fast as possible. on_frame, if given, is called after every
+    frame (e.g. to render with offscreen.OffscreenRenderer). Returns
+    (frames, seconds) for the replay.
+    """
+    import spinner
+
+    seed, events = read_session(path)
+    spinner.config.headless = True
+    spinner.seed_rng(seed)
+    spinner.resize_me()
+
+    frames = 0
+    start = time.perf_counter()
+    for event in events:
+        kind = event[0]
+        if kind == FRAME:
+            spinner.advance_frame(event[1])
+            frames += 1
+            if on_frame is not None:
+                on_frame(spinner)
+        elif kind == KEY:
+            spinner.KEY_BINDINGS[spinner.KEYS[event[1]]]()
+        elif kind == CLICK:
+            spinner.handle_mouse_click(event[1], event[2], event[3], event[4])
+        elif kind == MOTION:
+            spinner.queue_pointer_sample(event[1], event[2], event[3])
+        elif kind == IMAGE:
+            # Installed like the live background load, which leaves the
+            # style to whatever the keys have made it meanwhile
+            size = int(spinner.config.spinner_radius * 2)
+            spinner.install_spinner_image(event[1], *spinner.prepare_spinner_image(event[1], size))
+    return frames, time.perf_counter() - start
+
+class PoseRenderer:
+    """Renders (style, arms, image, turn) poses, one OffscreenRenderer per look.
+
+    An image pose without a path (the image style before its image loaded)
+    renders as the bearing-only placeholder.
+    """
+
+    def __init__(self):
+        self.renderers = {}
+
+    def render(self, pose):
+        from offscreen import OffscreenRenderer
+
+        style, arm_count, image_path, turn = pose
+        key = (style, arm_count, image_path)
+        if key not in self.renderers:
+            self.renderers[key] = OffscreenRenderer(style=style, arm_count=arm_count,
+                                                    image_path=image_path)
+        return self.renderers[key].render(turn)
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay a recorded spinner session headlessly")
+    parser.add_argument('session', help="file written with spinner.py --record")
+    parser.add_argument('--render', metavar='PATH',
+                        help="also render every frame offscreen and export a clip (.gif/.webp or directory)")
+    args = parser.parse_args(argv)
+
+    poses = []
+    def collect(spinner):
+        state = spinner.state
+        poses.append((state.spinner_style, state.arm_count, state.image_path,
+                      spinner.physics.turn))
+
+    frames, seconds = replay_session(args.session, on_frame=collect if args.render else None)
+    print(f"Replayed {frames} frames in {seconds:.3f}s ({frames / max(seconds, 1e-9):.0f} fps)")
+
+    if args.render:
+        from offscreen import export_clip
+        export_clip(args.render, poses, PoseRenderer())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
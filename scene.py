@@ -0,0 +1,124 @@
+"""Many independently spinning spinners with structure-of-arrays storage."""
+
+import numpy as np
+
+from physics import TIMESTEP, STOP_THRESHOLD, MAX_FRAME_TIME
+
+class Scene:
+    """A wall of spinners updated with one vectorized physics call per frame.
+
+    Per-spinner values live in parallel NumPy arrays indexed by spinner id.
+    Angular velocity uses the same per-tick units as SpinnerPhysics.
+    """
+
+    def __init__(self, capacity=64, timestep=TIMESTEP, stop_threshold=STOP_THRESHOLD,
+                 max_frame_time=MAX_FRAME_TIME, angle_resolution=1.0):
+        self.count = 0
+        self.timestep = timestep
+        self.stop_threshold = stop_threshold
+        self.max_frame_time = max_frame_time
+        self.angle_resolution = angle_resolution  # Degrees a spinner must move to need a redraw
+        self.accumulator = 0.0
+
+        self.turn = np.zeros(capacity)
+        self.angular_velocity = np.zeros(capacity)
+        self.inertia = np.zeros(capacity)
+        self.decay = np.zeros(capacity)       # inertia ** (timestep * 60), cached
+        self.position = np.zeros((capacity, 2))
+        self.radius = np.zeros(capacity)
+        self.arm_count = np.zeros(capacity, dtype=np.int8)
+        self.rendered_turn = np.zeros(capacity, dtype=np.int64)  # Quantized turn last drawn
+        self.moved = np.zeros(capacity, dtype=bool)             # Position changed since last draw
+
+    def _grow(self):
+        """Double the capacity of every per-spinner array."""
+        for name in ('turn', 'angular_velocity', 'inertia', 'decay', 'position',
+                     'radius', 'arm_count', 'rendered_turn', 'moved'):
+            old = getattr(self, name)
+            new = np.zeros((max(len(old), 1) * 2,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def add_spinner(self, x, y, radius=50, arm_count=3, inertia=0.995, turn=0.0):
+        """Add a spinner and return its index."""
+        if self.count == len(self.turn):
+            self._grow()
+        i = self.count
+        self.turn[i] = turn
+        self.angular_velocity[i] = 0.0
+        self.inertia[i] = inertia
+        self.decay[i] = pow(inertia, self.timestep * 60)
+        self.position[i] = (x, y)
+        self.radius[i] = radius
+        self.arm_count[i] = arm_count
+        self.rendered_turn[i] = self._quantize(turn)
+        self.moved[i] = True
+        self.count += 1
+        return i
+
+    def flick(self, index, velocity):
+        """Set one spinner's angular velocity."""
+        self.angular_velocity[index] = velocity
+
+    def move(self, index, x, y):
+        """Reposition one spinner."""
+        self.position[index] = (x, y)
+        self.moved[index] = True
+
+    def step(self, n=1):
+        """Advance every spinner up to n fixed timesteps at once.
+
+        Stops early once every spinner is at rest. Returns the number of
+        steps actually integrated.
+        """
+        count = self.count
+        turn = self.turn[:count]
+        velocity = self.angular_velocity[:count]
+        decay = self.decay[:count]
+        scale = self.timestep * 60
+        steps = 0
+        for _ in range(n):
+            spinning = np.abs(velocity) > self.stop_threshold
+            if not spinning.any():
+                velocity[:] = 0
+                break
+            turn += np.where(spinning, velocity * scale, 0.0)
+            velocity *= np.where(spinning, decay, 0.0)
+            steps += 1
+        return steps
+
+    def advance(self, elapsed):
+        """Accumulator driver, as in SpinnerPhysics.advance()."""
+        self.accumulator += min(max(elapsed, 0.0), self.max_frame_time)
+        steps = int(self.accumulator / self.timestep)
+        if steps:
+            self.step(steps)
+            self.accumulator -= steps * self.timestep
+        return steps
+
+    def spinning(self):
+        """Boolean mask of spinners above the stop threshold."""
+        return np.abs(self.angular_velocity[:self.count]) > self.stop_threshold
+
+    def _quantize(self, turn):
+        return np.round(np.asarray(turn) / self.angle_resolution).astype(np.int64)
+
+    def dirty(self):
+        """Indices of spinners whose on-screen pose changed since mark_clean()."""
+        count = self.count
+        changed = self._quantize(self.turn[:count]) != self.rendered_turn[:count]
+        return np.nonzero(changed | self.moved[:count])[0]
+
+    def mark_clean(self, indices):
+        """Record that the given spinners were drawn in their current pose."""
+        self.rendered_turn[indices] = self._quantize(self.turn[indices])
+        self.moved[indices] = False
+
+    def spinner_at(self, x, y):
+        """Index of the spinner under (x, y), or None."""
+        if not self.count:
+            return None
+        offset = self.position[:self.count] - (x, y)
+        distance = np.hypot(offset[:, 0], offset[:, 1]) - self.radius[:self.count]
+        nearest = int(np.argmin(distance))
+        return nearest if distance[nearest] <= 0 else None
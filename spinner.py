@@ -1,56 +1,208 @@
+import time
+STARTUP_TIME = time.perf_counter()  # Reference point for --startup-profile
+
 from turtle import *
 import random
 import colorsys
 import math
-import time
 import os
+import threading
+import importlib.util
+from collections import OrderedDict
 
-# Try to import PIL for image support
-try:
-    from PIL import Image, ImageTk
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
+import geometry
+import hud
+from physics import SpinnerPhysics
+from hittest import HitTester
+from profiler import profiler
+from palette import ColorTransition, speed_steps
+from pointer import PointerTracker
+from quality import QualityController
+from pacer import FramePacer, FRAME_RATES
+from spinner_state import SpinnerConfig, SpinnerState
+
+# PIL is only imported once an image is actually needed (see pil_modules())
+PIL_AVAILABLE = importlib.util.find_spec('PIL') is not None
+if not PIL_AVAILABLE:
     print("PIL not available. Custom image loading disabled.")
 
-# Initial spinner state
-state = {
-    'turn': 0,
-    'speed': 0,
-    'angular_velocity': 0,
-    'inertia': 0.995,  # Higher value = longer spin time
-    'background_color': (1.0, 1.0, 1.0),
-    'target_color': (1.0, 1.0, 1.0),
-    'base_color_step': 0.01,
-    'color_intensity': 0.5,  # Controls how vibrant background colors get
-    'last_mouse_pos': None,
-    'dragging': False,
-    'drag_offset_x': 0,
-    'drag_offset_y': 0,
-    'drag_center_x': 0,
-    'drag_center_y': 0,
-    'last_update_time': time.time(),
-    'last_angle': 0,
-    'arm_count': 3,
-    'arm_length': 100,
-    'spinner_style': 'classic',  # 'classic', 'tri', 'gear', 'image'
-    'effects_enabled': True,
-    'handle_dragged': False,
-    'spinner_radius': 150,
-    'handle_radius': 40,
-    'spinner_position': (0, 0),  # Center of spinner
-    'handle_position': (0, 0),   # Position of draggable handle
-    'transition_duration': 1.0,  # Background transition duration
-    'background_init': True,     # Allow background changes
-    'spinner_image': None,       # Store loaded spinner image
-    'image_path': None,          # Path to spinner image
-    'last_bg_update': 0,         # Last background update time
-    'bg_update_interval': 0.05,  # Background update interval (seconds)
-    'ui_elements': []            # Store UI element positions to avoid spinning them
+# Bundled sprite offered as the image style until another image is loaded
+DEFAULT_IMAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "spinner.png")
+
+# How long a new radius must stay put before its sprite gets an atlas
+ATLAS_SETTLE_MS = 500
+
+# Tunables, and the spinner state that changes while it runs
+config = SpinnerConfig()
+state = SpinnerState()
+
+# (phase, perf_counter time) marks for --startup-profile
+startup_marks = [('start', STARTUP_TIME)]
+
+# Lerp step per quantized speed factor for background transitions
+background_steps = speed_steps(config.base_color_step)
+
+# Spin physics (turn, angular velocity, inertia); higher inertia = longer spin time
+physics = SpinnerPhysics(inertia=config.inertia)
+
+# Seeded RNG for flicks and background colors, so sessions can be replayed
+rng = random.Random()
+
+# Session recorder (see replay.py), set by start_recording()
+recorder = None
+
+# Pointer samples from <B1-Motion>, coalesced once per frame
+pointer = PointerTracker(capacity=64)
+
+# Clickable regions: spinner and handle circles, button rectangles, and the
+# HUD boxes in state.ui_elements
+hit_regions = HitTester(cell_size=64)
+
+# Stacking order of HUD boxes in hit_regions: beneath the spinner (0), so the
+# speedometer's box never steals a drag, but still reported where nothing
+# else is
+UI_LAYER = -1
+
+# Rendering detail level, lowered while frames run over budget
+quality = QualityController()
+
+# Frame timing on the monotonic clock (see set_frame_rate())
+pacer = FramePacer(config.target_fps)
+
+# Optional wall of independent spinners, see build_wall()
+scene = None
+scene_items = []  # Canvas item ids for each wall spinner
+
+# LRU of rotated PhotoImages keyed by quantized angle step
+rotation_cache = OrderedDict()
+
+# Memory-mapped atlas of the current image's rotation steps, once one exists
+sprite_atlas = None
+
+# Worker threads rotating upcoming image frames (see prerender.py)
+predictor = None
+
+# Blurred frames for the current look and the look they were built for
+blur_frames = None
+blur_look = None
+
+# Canvas items owned by the retained renderer
+render_items = {
+    'key': None,                # (style, arm_count) the spinner items were built for
+    'spinner': [],              # One canvas item per spinner shape
+    'image': None,              # Canvas image item for the image style
+    'image_frame': None,        # PhotoImage currently shown by the image item
+    'text': [],                 # HUD hud.TextItem per line of HUD_LINES
+    'speedometer': None,        # Speedometer hud.ArcItem
+    'ui_visible': None,         # Whether the HUD items are currently shown
+    'profiler_hud': None,       # Profiler overlay text item
+    'profiler_hud_time': 0      # When the overlay was last refreshed
 }
 
-# Global click handlers list
-click_handlers = []
+def mark_startup(phase):
+    """Record the end of a startup phase."""
+    startup_marks.append((phase, time.perf_counter()))
+
+def report_startup():
+    """Print how long each startup phase took."""
+    phases = [f"{phase} {(t - startup_marks[i][1]) * 1000:.1f} ms"
+              for i, (phase, t) in enumerate(startup_marks[1:])]
+    total = (startup_marks[-1][1] - STARTUP_TIME) * 1000
+    print(f"Startup: {', '.join(phases)}; total {total:.1f} ms")
+
+def pil_modules():
+    """Import PIL on first use; returns (Image, ImageTk)."""
+    from PIL import Image, ImageTk
+    return Image, ImageTk
+
+def decode_spinner_image(path, size):
+    """Image at size x size from its shared pyramid. Safe off the Tk thread."""
+    import pyramid  # Imports PIL
+    return pyramid.pyramid_for(path).resized(size)
+
+def prepare_spinner_image(path, size):
+    """Sprite for path plus its cached atlas, if any. Safe off the Tk thread.
+
+    With a cached atlas the sprite is its unrotated frame, so the PNG is
+    never decoded or resampled. It is copied out of the mapping, so the
+    atlas can be closed while the sprite lives on.
+    """
+    if config.sprite_cache and not config.headless:
+        import atlas
+        cached = atlas.open_atlas(path, size, config.rotation_steps)
+        if cached is not None:
+            return cached.frame(0).copy(), cached
+    return decode_spinner_image(path, size), None
+
+def build_sprite_atlas(path, img):
+    """Write the atlas for a freshly decoded image on a worker thread.
+
+    Like load_spinner_image_async(), the worker only touches files; a timer
+    on the Tk thread polls for the finished atlas and adopts it.
+    """
+    steps = config.rotation_steps
+    result = {}
+    
+    def work():
+        import atlas
+        try:
+            atlas_file = atlas.atlas_path(path, img.width, steps)
+            atlas.build_atlas(atlas_file, img, steps)
+            result['atlas'] = atlas.SpriteAtlas(atlas_file)
+            atlas.prune_cache(keep=[atlas_file])
+        except OSError as e:
+            result['error'] = e
+    
+    worker = threading.Thread(target=work, daemon=True)
+    worker.start()
+    
+    def poll():
+        if worker.is_alive():
+            ontimer(poll, 50)
+            return
+        if 'error' in result:
+            print(f"Could not cache sprite frames: {result['error']}")
+            return
+        # Only adopt it if the image wasn't replaced or rescaled meanwhile
+        if state.original_pil_image is img and sprite_atlas is None:
+            attach_sprite_atlas(path, img, result['atlas'])
+        else:
+            result['atlas'].close()
+    ontimer(poll, 50)
+
+def swap_spinner_sprite(path, img):
+    """Show img as the spinner sprite and drop frames rotated from the old one."""
+    # Convert to PhotoImage for turtle (replays have no Tk to upload to)
+    photo_img = img if config.headless else pil_modules()[1].PhotoImage(img)
+    state.spinner_image = photo_img
+    state.original_pil_image = img
+    state.image_path = path
+    # Frames rendered from the previous image are stale now
+    rotation_cache.clear()
+    reset_blur_frames()
+
+def attach_sprite_atlas(path, img, cached=None):
+    """Use cached as the atlas for img, or build one in the background."""
+    global sprite_atlas
+    if sprite_atlas is not None and sprite_atlas is not cached:
+        sprite_atlas.close()
+    sprite_atlas = cached
+    if cached is None and config.sprite_cache and not config.headless:
+        build_sprite_atlas(path, img)
+    if atlas_ready():
+        # Every frame is already rotated on disk
+        stop_frame_predictor()
+    elif config.render_workers and not config.headless:
+        start_frame_predictor(img)
+
+def install_spinner_image(path, img, cached=None):
+    """Make a decoded image the spinner image. Must run on the Tk thread."""
+    swap_spinner_sprite(path, img)
+    attach_sprite_atlas(path, img, cached)
+    if config.precompute_rotations and not config.headless:
+        precompute_rotation_frames()
+    if recorder is not None:
+        recorder.image(path)
 
 def load_spinner_image(path):
     """Load a custom spinner image if path exists."""
@@ -60,15 +212,8 @@ def load_spinner_image(path):
         
     try:
         if os.path.exists(path):
-            # Load and create PhotoImage
-            img = Image.open(path)
-            # FIXED: Resize to maintain 1:1 aspect ratio with proper dimensions
-            img = img.resize((int(state['spinner_radius']*2), int(state['spinner_radius']*2)), Image.Resampling.LANCZOS)
-            # Convert to PhotoImage for turtle
-            photo_img = ImageTk.PhotoImage(img)
-            state['spinner_image'] = photo_img
-            state['image_path'] = path
-            state['spinner_style'] = 'image'
+            install_spinner_image(path, *prepare_spinner_image(path, int(config.spinner_radius*2)))
+            state.spinner_style = 'image'
             return True
         else:
             print(f"Image not found: {path}")
@@ -76,121 +221,438 @@ def load_spinner_image(path):
     except Exception as e:
         print(f"Error loading image: {e}")
         return False
+
+def load_spinner_image_async(path):
+    """Decode an image on a worker thread and install it when ready.
+
+    Tk isn't thread safe, so the worker only does the PIL work; a timer on
+    the Tk thread polls for the result and creates the PhotoImage.
+    """
+    if state.image_loading:
+        return
+    state.image_loading = True
+    size = int(config.spinner_radius*2)
+    started = time.perf_counter()
+    result = {}
+    
+    def work():
+        try:
+            result['image'] = prepare_spinner_image(path, size)
+        except Exception as e:
+            result['error'] = e
+    
+    worker = threading.Thread(target=work, daemon=True)
+    worker.start()
+    
+    def poll():
+        if worker.is_alive():
+            ontimer(poll, 20)
+            return
+        state.image_loading = False
+        if 'error' in result:
+            print(f"Error loading image: {result['error']}")
+            return
+        install_spinner_image(path, *result['image'])
+        if config.startup_profile:
+            print(f"Image loaded in background in {(time.perf_counter() - started) * 1000:.1f} ms")
+        wake()
+    ontimer(poll, 20)
+
+def available_image_path():
+    """Image the image style would show: the loaded one or the bundled sprite."""
+    if state.image_path:
+        return state.image_path
+    if PIL_AVAILABLE and os.path.exists(DEFAULT_IMAGE_PATH):
+        return DEFAULT_IMAGE_PATH
+    return None
+
+def quantize_angle(turn):
+    """Map a turn angle to the nearest cached rotation step."""
+    steps = config.rotation_steps
+    # At reduced quality only every stride-th step is used, so fewer frames
+    # get rendered and uploaded
+    stride = quality.settings()['rotation_stride']
+    return int(round((turn % 360) * steps / 360 / stride)) * stride % steps
+
+def get_rotated_frame(turn, exact=False):
+    """Return the PhotoImage for a turn angle, rendering it on first use.
+
+    While worker threads are rotating frames ahead, a frame they haven't
+    finished is stood in for by a ready one a few steps away instead of
+    rotating on the Tk thread, unless exact is set.
+    """
+    step = quantize_angle(turn)
+    frame = rotation_cache.get(step)
+    if frame is not None:
+        rotation_cache.move_to_end(step)
+        return frame
+    
+    rotated_image = None
+    from_atlas = atlas_ready()
+    if predictor is not None and not from_atlas:
+        rotated_image = predictor.get(step)
+        if rotated_image is None and not exact:
+            frame = nearest_ready_frame(step)
+            if frame is not None:
+                return frame
+    
+    if rotated_image is None:
+        if from_atlas:
+            # Already rotated on disk; this only reads the mapped frame
+            rotated_image = sprite_atlas.frame(step)
+        else:
+            # Rotate the image based on the quantized angle
+            angle = step * 360 / config.rotation_steps
+            rotated_image = state.original_pil_image.rotate(-angle)  # Negative for clockwise rotation
+    frame = pil_modules()[1].PhotoImage(rotated_image)
+    
+    # Keep the cache bounded, dropping the least recently used frame
+    rotation_cache[step] = frame
+    while len(rotation_cache) > config.rotation_cache_size:
+        rotation_cache.popitem(last=False)
+    return frame
+
+def precompute_rotation_frames():
+    """Render all rotation steps up front (bounded by the cache size)."""
+    steps = min(config.rotation_steps, config.rotation_cache_size)
+    for step in range(steps):
+        get_rotated_frame(step * 360 / config.rotation_steps, exact=True)
+
+def nearest_ready_frame(step, reach=4):
+    """Cached PhotoImage within reach steps of step, or None."""
+    steps = config.rotation_steps
+    for distance in range(1, reach + 1):
+        for candidate in ((step + distance) % steps, (step - distance) % steps):
+            frame = rotation_cache.get(candidate)
+            if frame is not None:
+                return frame
+    return None
+
+def atlas_ready():
+    """Whether the sprite atlas holds every rotation step of the current image."""
+    return sprite_atlas is not None and sprite_atlas.steps == config.rotation_steps
+
+def stop_frame_predictor():
+    """Stop the frame workers, if running (an atlas made them redundant)."""
+    global predictor
+    if predictor is not None:
+        predictor.close()
+        predictor = None
+
+def start_frame_predictor(img):
+    """Point the frame workers at a new image, starting them the first time."""
+    global predictor
+    steps = config.rotation_steps
+    
+    def rotated(step):
+        return img.rotate(-step * 360 / steps)  # Negative for clockwise rotation
+    
+    def render(step, level):
+        if level is None:
+            return rotated(step)
+        return blend_image_poses(lambda s: rotated(s).convert('RGBA'), level, step, steps)
+    
+    if predictor is None:
+        from prerender import FramePredictor
+        predictor = FramePredictor(render, quantize_angle, workers=config.render_workers,
+                                   frame_time=1 / config.target_fps)
+    else:
+        predictor.set_source(render)
+        predictor.frame_time = 1 / config.target_fps
+
+def create_shape_items(canvas, styles, coords):
+    """Create canvas items for tessellated shapes; returns their ids."""
+    items = []
+    for (kind, fill, outline, width), flat in zip(styles, coords):
+        if kind == 'line':
+            items.append(canvas.create_line(flat, fill=outline, width=width))
+        else:
+            items.append(canvas.create_polygon(flat, fill=fill, outline=outline, width=width))
+    return items
+
+def clear_spinner_items(canvas):
+    """Delete the canvas items of the current spinner style."""
+    for item in render_items['spinner']:
+        canvas.delete(item)
+    render_items['spinner'] = []
+    if render_items['image'] is not None:
+        canvas.delete(render_items['image'])
+        render_items['image'] = None
+        render_items['image_frame'] = None
+    render_items['key'] = None
+
+def build_spinner_items(canvas, key, styles, coords):
+    """Create one canvas item per shape for a style and arm count."""
+    clear_spinner_items(canvas)
+    render_items['spinner'] = create_shape_items(canvas, styles, coords)
+    render_items['key'] = key
+
 def draw_spinner():
     """Draw realistic spinner with arms connected to the center."""
-    clear()
-    
-    # Draw UI elements first (so they don't rotate with spinner)
-    if not state['dragging'] and not state['handle_dragged']:
+    canvas = getscreen().getcanvas()
+    
+    # UI elements don't rotate with the spinner and are hidden while dragging
+    show_ui = not state.dragging and not state.handle_dragged
+    if show_ui != render_items['ui_visible']:
+        ui_state = 'normal' if show_ui else 'hidden'
+        for hud_item in render_items['text'] + [render_items['speedometer']]:
+            if hud_item is not None:
+                canvas.itemconfig(hud_item.item, state=ui_state)
+        render_items['ui_visible'] = show_ui
+    if show_ui:
         draw_speedometer()
         draw_text()
         draw_controls()
     
-    # Set position based on spinner position
-    penup()
-    goto(state['spinner_position'])
-    
-    # Draw spinner based on selected style
-    if state['spinner_style'] == 'image' and state['spinner_image']:
-        draw_image_spinner()
+    # Draw spinner based on selected style; until its image has loaded the
+    # image style tessellates to just the bearing, which serves as placeholder
+    level = blur_level()
+    if state.spinner_style == 'image' and state.spinner_image:
+        draw_image_spinner(level)
+    elif level is not None:
+        draw_blurred_spinner(canvas, level)
     else:
-        # Draw basic spinner with rotation
-        setheading(state['turn'])  # Apply rotation to spinner
-        
-        # Draw central bearing
-        penup()
-        pendown()
-        pencolor('black')
-        fillcolor('gray')
-        begin_fill()
-        circle(state['handle_radius'])
-        end_fill()
-        
-        # Add bearing details
-        penup()
-        pendown()
-        fillcolor('darkgray')
-        begin_fill()
-        circle(10)
-        end_fill()
-        
-        # Draw spinner arms based on selected style
-        if state['spinner_style'] == 'classic':
-            draw_classic_spinner()
-        elif state['spinner_style'] == 'tri':
-            draw_tri_spinner()
-        elif state['spinner_style'] == 'gear':
-            draw_gear_spinner()
-
-    # Draw draggable handle (separate from spinner rotation)
+        draw_vector_spinner(canvas)
+    
+    with profiler.stage('tk_update'):
+        update()
 
+@profiler.timed('draw_vector_spinner')
+def draw_vector_spinner(canvas):
+    """Move the retained items of a vector style to the current pose."""
+    # Shapes are tessellated once; each frame only rotates the cached vertices
+    settings = quality.settings()
+    tessellation = geometry.tessellate(state.spinner_style, state.arm_count,
+                                       config.arm_length, config.handle_radius,
+                                       detail=settings['detail'], rings=settings['rings'])
+    coords = tessellation.placed(render_turn(), state.spinner_position, flip_y=True)
+    
+    # Items are only (re)created when the style, arm count or quality changes
+    key = (state.spinner_style, state.arm_count, settings['detail'], settings['rings'])
+    if key != render_items['key']:
+        build_spinner_items(canvas, key, tessellation.styles, coords)
+        return
     
-    update()
+    for item, flat in zip(render_items['spinner'], coords):
+        canvas.coords(item, flat)
 
-def draw_image_spinner():
+@profiler.timed('draw_image_spinner')
+def draw_image_spinner(blur_level=None):
     """Draw spinner using loaded image with rotation."""
-    if not state['spinner_image'] or not PIL_AVAILABLE:
+    if not state.spinner_image or not PIL_AVAILABLE:
         return
     
-    # Calculate image position (centered on spinner position)
-    # FIXED: Corrected the positioning calculation to center the image properly
-    img_x = state['spinner_position'][0] - state['spinner_radius'] * 7.4442
-    img_y = state['spinner_position'][1] - state['spinner_radius'] * -4.5
+    canvas = getscreen().getcanvas()
     
     try:
-        # Get the original PIL image (we need to store this separately)
-        if 'original_pil_image' not in state:
-            # Get original image path
-            image_path = state['image_path']
-            # Open and store the original PIL image
-            state['original_pil_image'] = Image.open(image_path)
-            # Resize to appropriate size while maintaining 1:1 aspect ratio
-            state['original_pil_image'] = state['original_pil_image'].resize(
-                (int(state['spinner_radius']*2), int(state['spinner_radius']*2)), 
-                Image.Resampling.LANCZOS
-            )
-        
-        # Rotate the image based on current turn angle
-        rotated_image = state['original_pil_image'].rotate(-state['turn'])  # Negative for clockwise rotation
-        
-        # Convert to PhotoImage
-        rotated_photo = ImageTk.PhotoImage(rotated_image)
-        
-        # Store reference to prevent garbage collection
-        state['current_rotated_image'] = rotated_photo
-        
-        # Get screen and canvas
-        screen = getscreen()
-        canvas = screen.getcanvas()
-        
-        # Clear previous images
-        for item_id in canvas.find_withtag("spinner_img"):
-            canvas.delete(item_id)
-        
-        # FIXED: Updated image placement to properly center it
-        canvas.create_image(
-            img_x + screen.window_width() // 2,
-            screen.window_height() // 2 - img_y,
-            image=state['current_rotated_image'],
-            tags=("spinner_img",),
-            anchor="nw"
-        )
-        
+        # Cached frame lookup instead of a resample and Tk upload every tick
+        if blur_level is None:
+            # Stand-in frames are fine in motion, but a resting spinner
+            # shows its exact angle
+            spinning = physics.is_spinning()
+            if atlas_ready():
+                # An atlas built in the background can arrive mid-spin
+                stop_frame_predictor()
+            elif predictor is not None and spinning:
+                predictor.publish(physics.turn, physics.angular_velocity, physics.inertia)
+            state.current_rotated_image = get_rotated_frame(render_turn(), exact=not spinning)
+        else:
+            # Blends are too slow for the Tk thread, so the workers make
+            # them even when an atlas has every crisp frame
+            if predictor is None and config.render_workers and not config.headless:
+                start_frame_predictor(state.original_pil_image)
+            if predictor is not None:
+                predictor.publish(physics.turn, physics.angular_velocity, physics.inertia,
+                                  blur_level)
+            state.current_rotated_image = get_blurred_image_frame(blur_level)
     except Exception as e:
         print(f"Error in image rotation: {e}")
-        # Fallback to original method if something goes wrong
-        screen = getscreen()
-        canvas = screen.getcanvas()
-        for item_id in canvas.find_withtag("spinner_img"):
-            canvas.delete(item_id)
-            
-        canvas.create_image(
-            img_x + screen.window_width() // 2,
-            screen.window_height() // 2 - img_y,
-            image=state['spinner_image'],
+        # Fallback to the unrotated image if something goes wrong
+        state.current_rotated_image = state.spinner_image
+    
+    show_sprite(canvas, ('image',), state.current_rotated_image)
+
+@profiler.timed('draw_blurred_spinner')
+def draw_blurred_spinner(canvas, level):
+    """Draw a vector style as a cached motion-blurred sprite."""
+    show_sprite(canvas, ('blur',), get_blur_frames().get(level, blur_step()))
+
+def show_sprite(canvas, key, frame):
+    """Show frame in the single spinner image item, creating it when key changes."""
+    x, y = state.spinner_position
+    if render_items['key'] != key:
+        clear_spinner_items(canvas)
+        render_items['image'] = canvas.create_image(
+            x, -y,
+            image=frame,
             tags=("spinner_img",),
-            anchor="nw"
+            anchor="center"
         )
+        render_items['image_frame'] = frame
+        render_items['key'] = key
+        return
+    
+    canvas.coords(render_items['image'], x, -y)
+    if render_items['image_frame'] is not frame:
+        canvas.itemconfig(render_items['image'], image=frame)
+        render_items['image_frame'] = frame
+
+def blur_level():
+    """Motion blur level for the current speed, or None to draw crisp."""
+    if not config.motion_blur or not PIL_AVAILABLE:
+        return None
+    if state.spinner_style == 'image' and not state.spinner_image:
+        return None  # Placeholder while the image loads
+    import blur
+    return blur.sweep_level(physics.angular_velocity, config.blur_shutter)
+
+def spinner_symmetry():
+    """How many times the current style repeats over a full turn."""
+    style = state.spinner_style
+    if style == 'classic':
+        return state.arm_count
+    if style == 'tri':
+        return 3
+    if style == 'gear':
+        return 12
+    return 1
+
+def blur_step():
+    """Rotation step of the current turn, folded by the style's symmetry."""
+    step = quantize_angle(render_turn())
+    # A symmetric style looks the same every 360/n degrees, so those steps
+    # can share blurred frames
+    steps = config.rotation_steps
+    symmetry = spinner_symmetry()
+    if steps % symmetry == 0:
+        step %= steps // symmetry
+    return step
+
+def blend_image_poses(pose, level, step, steps):
+    """Blend of the image poses a blur level sweeps over around step.
+
+    pose(step) is the RGBA image rotated to a step. Safe off the Tk thread.
+    """
+    import blur
+    width = blur.SWEEPS[level] * steps / 360  # In rotation steps
+    offsets = [round(width * (k / (blur.SAMPLES - 1) - 0.5)) for k in range(blur.SAMPLES)]
+    return blur.average([pose((step + o) % steps) for o in offsets])
+
+def get_blurred_image_frame(level):
+    """Blurred PhotoImage of the image style at the current turn.
+
+    While the frame workers run they make the blend; until it is ready a
+    crisp frame near the turn, or the frame already on screen, stands in.
+    """
+    frames = get_blur_frames()
+    step = blur_step()
+    if predictor is None:
+        return frames.get(level, step)
+    frame = frames.cached(level, step)
+    if frame is not None:
+        return frame
+    blended = predictor.get(step, level)
+    if blended is not None:
+        return frames.add(level, step, pil_modules()[1].PhotoImage(blended))
+    stand_in = rotation_cache.get(step) or nearest_ready_frame(step)
+    return stand_in or state.current_rotated_image or state.spinner_image
+
+def reset_blur_frames():
+    """Forget blurred frames (the image or look changed)."""
+    global blur_frames, blur_look
+    blur_frames = None
+    blur_look = None
+
+def get_blur_frames():
+    """Blurred frame cache for the current look, rebuilt when the look changes."""
+    global blur_frames, blur_look
+    look = (state.spinner_style, state.arm_count, config.arm_length,
+            config.handle_radius, config.spinner_radius, config.rotation_steps)
+    if blur_frames is not None and look == blur_look:
+        return blur_frames
+    
+    import blur
+    ImageTk = pil_modules()[1]
+    steps = config.rotation_steps
+    
+    if state.spinner_style == 'image':
+        # Blend a few neighbouring rotation steps of the image; only used
+        # without frame workers, which otherwise make the blends
+        original = state.original_pil_image
+        
+        def pose(step):
+            if atlas_ready():
+                return sprite_atlas.frame(step)
+            return original.rotate(-step * 360 / steps).convert('RGBA')
+        
+        def make(level, step):
+            return ImageTk.PhotoImage(blend_image_poses(pose, level, step, steps))
+    else:
+        # Sweep the style once per blur level, then only rotate the result
+        from offscreen import OffscreenRenderer
+        tessellation = geometry.tessellate(state.spinner_style, state.arm_count,
+                                           config.arm_length, config.handle_radius)
+        xs, ys = tessellation.vertices
+        reach = max(math.hypot(x, y) for x, y in zip(xs, ys)) + 4  # Room for outlines
+        renderer = OffscreenRenderer(style=state.spinner_style, size=int(reach * 2),
+                                     arm_count=state.arm_count, arm_length=config.arm_length,
+                                     handle_radius=config.handle_radius, background=None)
+        swept = {}
+        
+        def make(level, step):
+            sprite = swept.get(level)
+            if sprite is None:
+                sprite = swept[level] = blur.swept_sprite(renderer.render, blur.SWEEPS[level])
+            return ImageTk.PhotoImage(sprite.rotate(step * 360 / steps))
+    
+    # A look could fill len(SWEEPS) * rotation_steps frames, but a spin
+    # mostly shows one level at a time, so blurred frames get the same
+    # PhotoImage budget as crisp ones rather than three times it
+    blur_frames = blur.BlurFrames(make, capacity=config.rotation_cache_size)
+    blur_look = look
+    return blur_frames
+
+def build_wall(count, spacing=110, radius=50):
+    """Lay out count independent spinners in a grid centered on the origin."""
+    global scene
+    from scene import Scene  # NumPy is only needed for the wall
+    
+    scene = Scene(capacity=count)
+    columns = math.ceil(math.sqrt(count))
+    rows = math.ceil(count / columns)
+    for i in range(count):
+        row, col = divmod(i, columns)
+        x = (col - (columns - 1) / 2) * spacing
+        y = ((rows - 1) / 2 - row) * spacing
+        scene.add_spinner(x, y, radius=radius, arm_count=state.arm_count)
+
+def wall_tessellation(index):
+    """Classic-style tessellation for one wall spinner, scaled to its radius."""
+    scale = float(scene.radius[index]) / config.spinner_radius
+    settings = quality.settings()
+    return geometry.tessellate('classic', int(scene.arm_count[index]),
+                               config.arm_length * scale, config.handle_radius * scale,
+                               scale, settings['detail'], settings['rings'],
+                               vectorized=True)  # NumPy is loaded for the wall anyway
+
+@profiler.timed('draw_scene')
+def draw_scene():
+    """Redraw only the wall spinners whose pose changed."""
+    canvas = getscreen().getcanvas()
+    dirty = scene.dirty()
+    for i in dirty:
+        tessellation = wall_tessellation(i)
+        coords = tessellation.placed(float(scene.turn[i]), tuple(scene.position[i]), flip_y=True)
+        if i < len(scene_items):
+            for item, flat in zip(scene_items[i], coords):
+                canvas.coords(item, flat)
+        else:
+            # First draw of this spinner creates its items
+            scene_items.append(create_shape_items(canvas, tessellation.styles, coords))
+    if len(dirty):
+        scene.mark_clean(dirty)
+        with profiler.stage('tk_update'):
+            update()
 
 def draw_handle():
     """Draw draggable handle element."""
@@ -200,7 +662,7 @@ def draw_handle():
     
     # Go to handle position
     penup()
-    goto(state['handle_position'])
+    goto(state.handle_position)
     pendown()
     
 
@@ -209,7 +671,7 @@ def draw_handle():
     pencolor('black')
     for i in range(3):
         penup()
-        goto(state['handle_position'][0], state['handle_position'][1] + i * 7 - 7)
+        goto(state.handle_position[0], state.handle_position[1] + i * 7 - 7)
         pendown()
         forward(20)
     
@@ -219,215 +681,97 @@ def draw_handle():
     setheading(current_heading)
     pendown()
 
-def draw_classic_spinner():
-    """Draw a classic 3-arm spinner with improved graphics."""
-    arm_count = state['arm_count']
-    arm_length = state['arm_length']
-    
-
-    
-    # Draw arms with circles
-    for i in range(arm_count):
-        angle = 360 / arm_count * i
-        draw_arm(angle, arm_length)
-
-def draw_tri_spinner():
-    """Draw a triangular spinner with improved graphics."""
-    arm_length = state['arm_length']
-    
-    # Draw triangle
-    penup()
-    pendown()
-    pencolor('black')
-    fillcolor('#50C878')  # Emerald green
-    begin_fill()
-    
-    for i in range(3):
-        setheading(state['turn'] + 120 * i)
-        forward(arm_length)
-        left(120)
-        forward(arm_length)
-        right(180)
-    
-    end_fill()
-    
-    # Draw circles at vertices with metallic look
-    for angle in [0, 120, 240]:
-        penup()
-        goto(state['spinner_position'])
-        setheading(state['turn'] + angle)
-        forward(arm_length)
-        pendown()
-        fillcolor('#D3D3D3')  # Light gray
-        begin_fill()
-        circle(15)
-        end_fill()
-        
-        # Add metallic detail
-        fillcolor('#A0A0A0')  # Darker gray for 3D effect
-        begin_fill() 
-        circle(8)
-        end_fill()
-
-def draw_gear_spinner():
-    """Draw a gear-style spinner with improved graphics."""
-    arm_length = state['arm_length']
-    tooth_count = 12
-    
-    penup()
-    goto(state['spinner_position'])
-    pendown()
-    
-    # Draw main gear body with metallic gradient
-    fillcolor('#B8B8B8')  # Lighter metallic
-    begin_fill()
-    circle(arm_length * 0.7)
-    end_fill()
-    
-    # Inner detail
-    fillcolor('#969696')  # Darker metallic for 3D effect
-    begin_fill()
-    circle(arm_length * 0.5)
-    end_fill()
-    
-    # Central hub
-    fillcolor('#787878')  # Even darker for depth
-    begin_fill()
-    circle(arm_length * 0.3)
-    end_fill()
-    
-    # Draw gear teeth with 3D appearance
-    for i in range(tooth_count):
-        angle = 360 / tooth_count * i
-        penup()
-        goto(state['spinner_position'])
-        setheading(state['turn'] + angle)
-        forward(arm_length * 0.7)
-        pendown()
-        
-        # Save position to return to
-        tooth_base = position()
-        
-        # Draw 3D-looking tooth
-        fillcolor('#D3D3D3')  # Light gray for tooth
-        begin_fill()
-        for _ in range(2):
-            forward(20)
-            right(90)
-            forward(10)
-            right(90)
-        end_fill()
-        
-        # Return to tooth base
-        penup()
-        goto(tooth_base)
-        pendown()
-
-def draw_arm(angle, length):
-    """Draw one spinner arm with connected line and outer circle - improved graphics."""
-    # Save starting position (center)
-    center_pos = position()
-    
-    # Draw line from center to arm
-    penup()
-    setheading(angle + state['turn'])
-    pendown()
-    pencolor('black')
-    pensize(4)
-    forward(length)
-    
-    # Save arm position
-    arm_pos = position()
-
-    # Draw outer circle at the end of arm with gradient for 3D effect
-    fillcolor('#5A5A5A')  # Dark gray base
-    begin_fill()
-    circle(30)
-    end_fill()
-    
-    # Add highlight circle for 3D effect
-    fillcolor('#D3D3D3')  # Light gray highlight
-    begin_fill()
-    circle(20)
-    end_fill()
-    
-    # Add "weight" circle in middle
-    fillcolor('#B8B8B8')  # Medium gray
-    begin_fill()
-    circle(10)
-    end_fill()
-    
-    # Outer decorative ring
-    penup()
-    circle(30, 180)
-    pendown()
-    pencolor('black')
-    pensize(2)
-    circle(30, 360)
-
+@profiler.timed('draw_speedometer')
 def draw_speedometer():
     """Visual arc based on speed."""
-    x, y = state['spinner_position']
-    penup()
-    goto(x, y - 180)
-    setheading(0)
-    pendown()
-    speed_ratio = min(abs(state['angular_velocity']) / 20, 1)
-    arc_extent = 180 * speed_ratio
+    x, y = state.spinner_position
+    speed_ratio = min(abs(physics.angular_velocity) / 20, 1)
+    # Whole steps only, so tiny velocity changes don't redraw the arc
+    arc_extent = hud.quantize(180 * speed_ratio, hud.ARC_STEP)
     
     # Gradient based on speed
     if speed_ratio < 0.3:
-        pencolor('blue')
+        arc_color = 'blue'
     elif speed_ratio < 0.7:
-        pencolor('green')
+        arc_color = 'green'
     else:
-        pencolor('red')
-        
-    pensize(5)
-    circle(180, arc_extent)
+        arc_color = 'red'
+    
+    # Arc starts at the bottom of a 180 radius circle and runs counterclockwise
+    bbox = (x - 180, -y - 180, x + 180, -y + 180)
+    if render_items['speedometer'] is None:
+        render_items['speedometer'] = hud.ArcItem(getscreen().getcanvas(), bbox, arc_extent,
+                                                  arc_color, start=270, width=5)
+    else:
+        render_items['speedometer'].update(bbox, arc_extent, arc_color)
     
-    # Store speedometer position in UI elements
-    state['ui_elements'].append(('speedometer', (x, y - 180)))
+    # Arc can sweep the right half of its circle
+    register_ui_element('speedometer', 'speedometer', (x, y - 180, 180, 360))
 
+@profiler.timed('draw_text')
 def draw_text():
     """Display spinner values with improved layout."""
     text_x = -230
     text_y = 180
     text_spacing = 22  # Increased spacing
     
-    penup()
-    goto(text_x, text_y)
-    color('black')
-    
-    # Display info with better formatting
-    speed_text = f"Speed: {abs(state['angular_velocity']):.2f}"
-    write(speed_text, font=("Arial", 12, "bold"))
-    
-    goto(text_x, text_y - text_spacing)
-    write(f"Direction: {'Forward' if state['angular_velocity'] >= 0 else 'Backward'}", 
-          font=("Arial", 12, "normal"))
-    
-    goto(text_x, text_y - 2*text_spacing)
-    write(f"Style: {state['spinner_style'].capitalize()}", font=("Arial", 12, "normal"))
-    
-    goto(text_x, text_y - 3*text_spacing)
-    write(f"Arms: {state['arm_count']}", font=("Arial", 12, "normal"))
-    
-    goto(text_x, text_y - 4*text_spacing)
-    write(f"Effects: {'On' if state['effects_enabled'] else 'Off'}", font=("Arial", 12, "normal"))
-    
-    goto(text_x, text_y - 5*text_spacing)
-    write("Drag the red handle or the spinner!", font=("Arial", 12, "bold"))
+    canvas = getscreen().getcanvas()
+    if not render_items['text']:
+        # Create the text items once, anchored like turtle's write()
+        for i, (value, formatter, font, _) in enumerate(HUD_LINES):
+            line = hud.TextItem(canvas, text_x - 1, -(text_y - i*text_spacing),
+                                formatter, value(), font)
+            render_items['text'].append(line)
+            register_ui_element(f'text{i}', 'text', canvas_box(canvas, line.item))
+        return
     
-    # Store text positions in UI elements
-    for i in range(6):
-        state['ui_elements'].append(('text', (text_x, text_y - i*text_spacing)))
+    # Items only reformat when their displayed value changes, and only the
+    # rarely changing lines pay for a bbox() query to update their layout box
+    for i, (line, (value, _, _, relayout)) in enumerate(zip(render_items['text'], HUD_LINES)):
+        if line.update(value()) and relayout:
+            register_ui_element(f'text{i}', 'text', canvas_box(canvas, line.item))
+
+# HUD lines as (display value, formatter, font, relayout). Values are
+# quantized to what the text shows, so nothing is formatted until the readout
+# would change. Lines that change every spinning frame keep the layout box
+# they were registered with (relayout False).
+HUD_LINES = [
+    (lambda: round(abs(physics.angular_velocity), hud.SPEED_DECIMALS),
+     lambda speed: f"Speed: {speed:.{hud.SPEED_DECIMALS}f}", ("Arial", 12, "bold"), False),
+    (lambda: physics.angular_velocity >= 0,
+     lambda forward: f"Direction: {'Forward' if forward else 'Backward'}", ("Arial", 12, "normal"),
+     False),
+    (lambda: state.spinner_style,
+     lambda style: f"Style: {style.capitalize()}", ("Arial", 12, "normal"), True),
+    (lambda: state.arm_count,
+     lambda arms: f"Arms: {arms}", ("Arial", 12, "normal"), True),
+    (lambda: state.effects_enabled,
+     lambda enabled: f"Effects: {'On' if enabled else 'Off'}", ("Arial", 12, "normal"), True),
+    (lambda: None,
+     lambda _: "Drag the red handle or the spinner!", ("Arial", 12, "bold"), False),
+]
+
+def canvas_box(canvas, item):
+    """Bounding box of a canvas item as an (x, y, w, h) turtle box."""
+    x0, y0, x1, y1 = canvas.bbox(item)
+    return (x0, -y1, x1 - x0, y1 - y0)
+
+def register_ui_element(element_id, kind, box):
+    """Record a UI element's box under a stable id, replacing any old entry."""
+    if state.ui_elements.get(element_id) == (kind, box):
+        return
+    state.ui_elements[element_id] = (kind, box)
+    hit_regions.add_rect(element_id, *box, z=UI_LAYER)
+
+def unregister_ui_element(element_id):
+    """Forget a UI element."""
+    state.ui_elements.pop(element_id, None)
+    hit_regions.remove(element_id)
 
 def draw_controls():
     """Draw clickable control buttons with improved styling."""
-    # Clear UI elements list for buttons
-    buttons = [b for b in state['ui_elements'] if b[0] != 'button']
-    state['ui_elements'] = buttons
+    # Buttons register under a stable id in draw_button(), so redrawing
+    # replaces their entries instead of growing the layout
     
 
     
@@ -440,7 +784,7 @@ def draw_button(x, y, w, h, text, command=None):
     pendown()
     
     # Store button position in UI elements
-    state['ui_elements'].append(('button', (x, y, w, h)))
+    register_ui_element(f'button:{text}', 'button', (x, y, w, h))
     
     # Button base with gradient effect
     pencolor('black')
@@ -484,50 +828,164 @@ def draw_button(x, y, w, h, text, command=None):
     
     # Register clickable area
     if command:
-        onclick_area(x, y, w, h, command)
+        onclick_area(x, y, w, h, command, region_id=f'button:{text}')
 
-def onclick_area(x, y, w, h, command):
-    """Register a clickable area."""
-    def check_click(x_click, y_click):
-        if x <= x_click <= x + w and y <= y_click <= y + h:
-            command()
-    
-    # Add to global click handlers list
-    global click_handlers
-    click_handlers.append(check_click)
+def onclick_area(x, y, w, h, command, region_id=None):
+    """Register a clickable area; redrawing the same area replaces it."""
+    if region_id is None:
+        region_id = f'area:{x},{y},{w},{h}'
+    # Buttons sit above the spinner so they stay clickable over it
+    hit_regions.add_rect(region_id, x, y, w, h, z=2, handler=command)
+
+def update_hit_regions():
+    """Move the spinner and handle hit circles to their current positions."""
+    spinner_x, spinner_y = state.spinner_position
+    hit_regions.add_circle('spinner', spinner_x, spinner_y, config.spinner_radius, z=0)
+    handle_x, handle_y = state.handle_position
+    hit_regions.add_circle('handle', handle_x, handle_y, config.handle_radius * 1.5, z=1)
+
+def frame_signature():
+    """Everything draw_spinner() depends on; equal signatures draw the same frame."""
+    return (render_turn(), physics.angular_velocity, state.spinner_position,
+            state.spinner_style, state.arm_count, state.effects_enabled,
+            state.dragging, state.handle_dragged, state.spinner_image)
+
+def wake():
+    """Restart the animation loop after input if it went idle."""
+    if state.loop_running:
+        return
+    state.loop_running = True
+    pacer.start()
+    ontimer(animate, 0)
+
+def wakes(fun):
+    """Wrap an input callback so it wakes the animation loop."""
+    def handler(*args):
+        fun(*args)
+        wake()
+    return handler
 
 def animate():
     """Handle animation frame with improved physics."""
-    # Calculate delta time for smooth animation
-    current_time = time.time()
-    dt = min(current_time - state['last_update_time'], 0.1)  # Cap dt to avoid large jumps
-    state['last_update_time'] = current_time
-    
-    # Apply physics with time delta
-    if abs(state['angular_velocity']) > 0.001:  # Lower threshold to keep spinning longer
-        # Apply rotation based on current speed
-        state['turn'] += state['angular_velocity'] * dt * 60  # Scale by 60 to maintain similar speed
-        
-        # Apply inertia with more realistic physics
-        state['angular_velocity'] *= pow(state['inertia'], dt * 60)  # Smoother decay
-        
+    profiler.begin_frame()
+    state.frame_start = time.perf_counter()
+    
+    # Delta time from the monotonic clock, so wall clock adjustments can't
+    # make the spinner jump
+    elapsed = pacer.tick()
+    
+    if recorder is not None:
+        recorder.frame(elapsed)
+    
+    if scene is not None:
+        # Wall mode: one vectorized physics update for every spinner
+        with profiler.stage('physics'):
+            scene.advance(elapsed)
+        draw_scene()
+        end_frame(scene.spinning().any())
+        return
+    
+    advance_frame(elapsed)
+    
+    # Skip the redraw when nothing visible changed
+    signature = frame_signature()
+    if signature != state.last_frame_signature:
+        draw_spinner()
+        state.last_frame_signature = signature
+    
+    end_frame(physics.is_spinning() or state.dragging or state.handle_dragged)
+
+def advance_frame(elapsed):
+    """Physics, background and drag updates for one frame, without drawing."""
+    state.clock += elapsed
+    
+    # Fixed-timestep physics; the engine caps dt to avoid large jumps
+    with profiler.stage('physics'):
+        physics.advance(elapsed)
+    
+    if physics.is_spinning():
         # More aggressive background color change based on speed
-        if state['effects_enabled'] and state['background_init']:
+        if state.effects_enabled and state.background_init:
             # Only update background at intervals to improve performance
-            if current_time - state['last_bg_update'] >= state['bg_update_interval']:
+            if state.clock - state.last_bg_update >= config.bg_update_interval:
                 transition_background()
-                state['last_bg_update'] = current_time
-    else:
-        state['angular_velocity'] = 0
+                state.last_bg_update = state.clock
     
     # Handle dragging logic
-    if state['dragging']:
+    if state.dragging:
         handle_spinner_drag()
-    elif state['handle_dragged']:
+    elif state.handle_dragged:
         handle_handle_drag()
 
-    draw_spinner()
-    ontimer(animate, 16)  # ~60 FPS
+def end_frame(active):
+    """Finish a frame; keep ticking while active, otherwise sleep until wake()."""
+    profiler.end_frame()
+    if config.adaptive_quality:
+        adapt_quality(time.perf_counter() - state.frame_start)
+    if profiler.enabled:
+        draw_profiler_hud()
+    if state.startup_pending:
+        state.startup_pending = False
+        mark_startup('first_frame')
+        if config.startup_profile:
+            report_startup()
+    if active:
+        # Wait whatever is left of the frame period, not a fixed 16 ms
+        ontimer(animate, pacer.delay())
+    else:
+        state.loop_running = False
+        profiler.mark_idle()
+
+def render_turn():
+    """Turn angle to draw: between physics steps unless the user is dragging."""
+    if config.interpolate and not state.dragging:
+        return physics.interpolated_turn()
+    return physics.turn
+
+def set_frame_rate(fps):
+    """Target fps for the pacer, the profiler's dropped frames and quality budget."""
+    config.target_fps = fps
+    pacer.set_rate(fps)
+    profiler.target_frame_time = 1 / fps
+    quality.target_frame_time = 1 / fps
+
+def adapt_quality(frame_cost):
+    """Feed a frame's cost to the quality controller and apply level changes."""
+    if not quality.update(frame_cost):
+        return
+    if scene is not None:
+        # Ring count can change, so every wall spinner gets new items
+        canvas = getscreen().getcanvas()
+        for items in scene_items:
+            for item in items:
+                canvas.delete(item)
+        scene_items.clear()
+        scene.moved[:scene.count] = True
+    # Redraw at the new level even if the spinner is at rest
+    state.last_frame_signature = None
+
+def draw_profiler_hud():
+    """Show rolling frame statistics in the top right corner."""
+    now = time.perf_counter()
+    if now - render_items['profiler_hud_time'] < 0.25:
+        return
+    render_items['profiler_hud_time'] = now
+    canvas = getscreen().getcanvas()
+    if render_items['profiler_hud'] is None:
+        render_items['profiler_hud'] = canvas.create_text(
+            440, -230, text='', anchor='ne', fill='black', font=("Courier", 10, "normal"))
+    canvas.itemconfig(render_items['profiler_hud'], text=profiler.hud_text())
+    update()
+
+def toggle_profiler():
+    """Toggle frame profiling and its overlay."""
+    profiler.enabled = not profiler.enabled
+    if profiler.enabled:
+        profiler.reset()
+        render_items['profiler_hud_time'] = 0
+    elif render_items['profiler_hud'] is not None:
+        getscreen().getcanvas().delete(render_items['profiler_hud'])
+        render_items['profiler_hud'] = None
 
 def load_image():
     """Prompt for image path and load it."""
@@ -540,156 +998,218 @@ def load_image():
     if path:
         if load_spinner_image(path):
             print(f"Loaded image: {path}")
+            wake()
         else:
             print(f"Failed to load image: {path}")
 
 def flick():
     """Flick the spinner with random direction and high speed."""
-    direction = 1 if random.random() > 0.5 else -1
-    state['angular_velocity'] = 20 * direction  # Increased speed
+    if scene is not None:
+        # Flick the whole wall, each spinner in its own random direction
+        for i in range(scene.count):
+            scene.flick(i, config.flick_speed * (1 if rng.random() > 0.5 else -1))
+        return
+    direction = 1 if rng.random() > 0.5 else -1
+    physics.angular_velocity = config.flick_speed * direction
 
 def change_style():
     """Cycle through spinner styles."""
     styles = ['classic', 'tri', 'gear']
     
-    # Add image style only if image is loaded
-    if state['spinner_image']:
+    # Add image style only if there is an image to show
+    image_path = available_image_path()
+    if image_path:
         styles.append('image')
         
     # Find current style index
     try:
-        current_index = styles.index(state['spinner_style'])
+        current_index = styles.index(state.spinner_style)
     except ValueError:
         current_index = 0
         
     # Set next style
-    state['spinner_style'] = styles[(current_index + 1) % len(styles)]
+    state.spinner_style = styles[(current_index + 1) % len(styles)]
+    
+    # The image is only decoded the first time its style comes up. Replays
+    # get it from the recorded image event instead, at the same frame.
+    if state.spinner_style == 'image' and not state.spinner_image and not config.headless:
+        load_spinner_image_async(image_path)
 
 def increase_arms():
     """Increase number of arms (max 6)."""
-    state['arm_count'] = min(6, state['arm_count'] + 1)
+    state.arm_count = min(6, state.arm_count + 1)
 
 def decrease_arms():
     """Decrease number of arms (min 2)."""
-    state['arm_count'] = max(2, state['arm_count'] - 1)
+    state.arm_count = max(2, state.arm_count - 1)
 
 def toggle_effects():
     """Toggle color effects on/off."""
-    state['effects_enabled'] = not state['effects_enabled']
-    if not state['effects_enabled']:
+    state.effects_enabled = not state.effects_enabled
+    if not state.effects_enabled:
         # Reset to white background when effects are disabled
-        state['background_color'] = (1.0, 1.0, 1.0)
-        bgcolor(state['background_color'])
-
-def lerp_colors(color1, color2, t):
-    """Linear interpolation between two colors."""
-    r = color1[0] + (color2[0] - color1[0]) * t
-    g = color1[1] + (color2[1] - color1[1]) * t
-    b = color1[2] + (color2[2] - color1[2]) * t
-    return (r, g, b)
+        state.background_color = (1.0, 1.0, 1.0)
+        state.bg_transition = None
+        state.bg_color_string = None
+        if not config.headless:
+            bgcolor(state.background_color)
 
+@profiler.timed('transition_background')
 def transition_background():
     """Change background color gradually based on spinner speed - improved."""
     # Increase step based on speed - more dynamic
-    speed_factor = min(abs(state['angular_velocity']) / 15, 1)  # More sensitive to speed
-    step = state['base_color_step'] * speed_factor * 5  # Faster transitions
-    
-    current = state['background_color']
-    target = state['target_color']
-    new_color = lerp_colors(current, target, step)
-    state['background_color'] = new_color
-    bgcolor(new_color)
+    speed_factor = min(abs(physics.angular_velocity) / 15, 1)  # More sensitive to speed
+    step = background_steps[int(speed_factor * (len(background_steps) - 1))]
+    
+    # The path to the target is precomputed once per target color
+    transition = state.bg_transition
+    if transition is None:
+        transition = ColorTransition(state.background_color, state.target_color)
+        state.bg_transition = transition
+    transition.advance(step)
+    state.background_color = transition.color()
+    
+    # Only repaint when the quantized color actually changes. At the lowest
+    # quality the repaint is skipped but the transition itself keeps running,
+    # so colors and RNG draws stay the same as at full quality.
+    color_string = transition.color_string()
+    if (color_string != state.bg_color_string and not config.headless
+            and quality.settings()['background']):
+        getscreen().getcanvas().config(bg=color_string)
+        state.bg_color_string = color_string
 
     # Pick new target if close enough
-    if all(abs(a - b) < 0.01 for a, b in zip(new_color, target)):
+    if transition.done():
         # Generate vibrant colors based on speed
         intensity = min(0.3 + speed_factor * 0.7, 1.0)  # Higher speed = more vibrant
-        state['target_color'] = hsv_color(intensity)
+        state.target_color = hsv_color(intensity)
+        state.bg_transition = None
 
 def hsv_color(intensity=0.8):
     """Return smooth random RGB from HSV with adjustable saturation."""
-    h = random.random()
+    h = rng.random()
     r, g, b = colorsys.hsv_to_rgb(h, intensity, 1.0)
     return (r, g, b)
 
 def reset():
     """Reset to original state."""
-    state.update({
-        'turn': 0,
-        'speed': 0,
-        'angular_velocity': 0,
-        'inertia': 0.995,
-        'background_color': (1.0, 1.0, 1.0),
-        'target_color': (1.0, 1.0, 1.0),
-        'arm_count': 3,
-        'spinner_style': 'classic',
-        'effects_enabled': True,
-        'spinner_position': (0, 0),
-        'handle_position': (0, 0),
-        'background_init': True
-    })
-    bgcolor(state['background_color'])
+    state.speed = 0
+    state.background_color = (1.0, 1.0, 1.0)
+    state.target_color = (1.0, 1.0, 1.0)
+    state.arm_count = 3
+    state.spinner_style = 'classic'
+    state.effects_enabled = True
+    state.spinner_position = (0, 0)
+    state.handle_position = (0, 0)
+    state.background_init = True
+    state.bg_transition = None
+    state.bg_color_string = None
+    physics.reset(inertia=config.inertia)
+    update_hit_regions()
+    if not config.headless:
+        bgcolor(state.background_color)
 
 def resize_me():
     """Initialize positions."""
-    state['spinner_position'] = (0, 0)
-    state['handle_position'] = (0, 0)
+    state.spinner_position = (0, 0)
+    state.handle_position = (0, 0)
+    update_hit_regions()
+
+def set_spinner_radius(radius):
+    """Scale the spinner, e.g. for another display size or a zoom effect.
+
+    The image is re-derived from its in-memory pyramid, not reloaded, and
+    only the sprite and its rotated frames are replaced. An atlas is looked
+    up or built only once the radius has stayed put for ATLAS_SETTLE_MS, so
+    a zoom through many sizes doesn't write one for each of them.
+    """
+    global sprite_atlas
+    config.spinner_radius = radius
+    update_hit_regions()
+    if not (state.spinner_image and state.image_path):
+        return
+    path = state.image_path
+    img = decode_spinner_image(path, int(radius*2))
+    swap_spinner_sprite(path, img)
+    # The atlas holds the old size
+    if sprite_atlas is not None:
+        sprite_atlas.close()
+        sprite_atlas = None
+    if predictor is not None:
+        start_frame_predictor(img)  # Re-points the running workers
+    if config.headless or not config.sprite_cache:
+        return
+    
+    def settle():
+        # Only if the zoom stopped here and no other image was loaded since
+        if state.original_pil_image is img and sprite_atlas is None:
+            import atlas
+            attach_sprite_atlas(path, img, atlas.open_atlas(path, img.width, config.rotation_steps))
+    
+    ontimer(settle, ATLAS_SETTLE_MS)
 
 # Mouse handling functions
-def handle_mouse_click(x, y, button_state):
-    """Handle mouse clicks and releases with improved detection."""
+def handle_mouse_click(x, y, button_state, t=None):
+    """Handle mouse clicks and releases with improved detection.
+
+    t is the event time in seconds, on the clock of the motion samples.
+    """
+    if scene is not None:
+        # Wall mode: clicking a spinner flicks it
+        index = scene.spinner_at(x, y)
+        if button_state == 1 and index is not None:
+            scene.flick(index, config.flick_speed * (1 if rng.random() > 0.5 else -1))
+        return
+    
     if button_state == 1:  # Mouse down
-        # Check if clicking on the handle
-        handle_x, handle_y = state['handle_position']
-        distance_to_handle = math.sqrt((x - handle_x)**2 + (y - handle_y)**2)
-        
-        # Check if clicking on the spinner center
-        spinner_x, spinner_y = state['spinner_position']
-        distance_to_spinner = math.sqrt((x - spinner_x)**2 + (y - spinner_y)**2)
+        region = hit_regions.hit(x, y)
         
-        if distance_to_handle <= state['handle_radius'] * 1.5:
+        if region == 'handle':
             # Dragging the handle
-            state['handle_dragged'] = True
-            state['drag_offset_x'] = x - handle_x
-            state['drag_offset_y'] = y - handle_y
+            handle_x, handle_y = state.handle_position
+            state.handle_dragged = True
+            state.drag_offset_x = x - handle_x
+            state.drag_offset_y = y - handle_y
             
-        elif distance_to_spinner <= state['spinner_radius']:
+        elif region == 'spinner':
             # Dragging the spinner itself
-            state['dragging'] = True
-            state['last_mouse_pos'] = (x, y)
-            state['last_angle'] = math.degrees(math.atan2(y - spinner_y, x - spinner_x))
+            spinner_x, spinner_y = state.spinner_position
+            state.dragging = True
+            state.last_mouse_pos = (x, y)
+            state.last_angle = math.degrees(math.atan2(y - spinner_y, x - spinner_x))
             on_drag_start()
+        
+        # Samples from an earlier drag must not leak into this one
+        pointer.clear()
             
     else:  # Mouse up
-        if state['dragging'] or state['handle_dragged']:
-            on_drag_stop()
+        if state.dragging or state.handle_dragged:
+            on_drag_stop(t)
             
-        state['dragging'] = False
-        state['handle_dragged'] = False
+        state.dragging = False
+        state.handle_dragged = False
         
         # Check for button clicks when releasing
-        for handler in click_handlers:
-            handler(x, y)
+        command = hit_regions.handler(hit_regions.hit(x, y))
+        if command:
+            command()
 
 def handle_spinner_drag():
     """Update spinner physics based on mouse movement - improved rotation."""
-    if not state['last_mouse_pos']:
+    if not state.last_mouse_pos:
         return
         
     # Get spinner center
-    spinner_x, spinner_y = state['spinner_position']
+    spinner_x, spinner_y = state.spinner_position
     
     # Calculate rotation from last position to current mouse position
-    x, y = state['last_mouse_pos']
-    
-    # Calculate the rotation needed
-    screen = getscreen()
-    new_x, new_y = screen.getcanvas().winfo_pointerxy()
-    win_x, win_y = screen.getcanvas().winfo_rootx(), screen.getcanvas().winfo_rooty()
+    x, y = state.last_mouse_pos
     
-    # Adjust coordinates relative to center of canvas
-    new_x = new_x - win_x - screen.window_width() // 2
-    new_y = win_y + screen.window_height() // 2 - new_y
+    # Newest pointer sample since the last frame, if any
+    sample = pointer.take()
+    if sample is None:
+        return
+    _, new_x, new_y = sample
     
     # Skip if mouse hasn't moved significantly 
     if abs(new_x - x) < 1 and abs(new_y - y) < 1:
@@ -699,7 +1219,7 @@ def handle_spinner_drag():
     new_angle = math.degrees(math.atan2(new_y - spinner_y, new_x - spinner_x))
     
     # Calculate angular difference
-    angle_diff = new_angle - state['last_angle']
+    angle_diff = new_angle - state.last_angle
     
     # Adjust for angle wrapping
     if angle_diff > 180:
@@ -708,110 +1228,171 @@ def handle_spinner_drag():
         angle_diff += 360
     
     # Set spinner speed based on the angular change
-    # Increased scale factor for more responsive spinning
-    scale_factor = 1.5
-    state['angular_velocity'] = angle_diff * scale_factor
+    # Scaled up for more responsive spinning
+    physics.angular_velocity = angle_diff * config.drag_scale
     
     # Update spinner rotation directly to follow mouse
-    state['turn'] += angle_diff
+    physics.turn += angle_diff
     
     # Update last values
-    state['last_angle'] = new_angle
-    state['last_mouse_pos'] = (new_x, new_y)
+    state.last_angle = new_angle
+    state.last_mouse_pos = (new_x, new_y)
 
 def handle_handle_drag():
     """Handle dragging of the handle element with fixed center offset."""
-    # Get the current mouse position
-    screen = getscreen()
-    mouse_x, mouse_y = screen.getcanvas().winfo_pointerxy()
-    win_x, win_y = screen.getcanvas().winfo_rootx(), screen.getcanvas().winfo_rooty()
-    
-    # Adjust coordinates relative to center of canvas
-    mouse_x = mouse_x - win_x - screen.window_width() // 2
-    mouse_y = win_y + screen.window_height() // 2 - mouse_y
+    # Newest pointer sample since the last frame, if any
+    sample = pointer.take()
+    if sample is None:
+        return
+    _, mouse_x, mouse_y = sample
     
     # Update handle position, accounting for drag offset
-    new_x = mouse_x - state['drag_offset_x']
-    new_y = mouse_y - state['drag_offset_y']
+    new_x = mouse_x - state.drag_offset_x
+    new_y = mouse_y - state.drag_offset_y
     
     # Update handle position
-    state['handle_position'] = (new_x, new_y)
+    state.handle_position = (new_x, new_y)
     
     # Update spinner position to match handle
-    state['spinner_position'] = (new_x, new_y)
+    state.spinner_position = (new_x, new_y)
+    update_hit_regions()
+
+def event_position(event):
+    """Turtle coordinates of a Tk event, using the cached canvas origin."""
+    origin_x, origin_y = state.canvas_origin
+    return event.x + origin_x, -(event.y + origin_y)
+
+def on_pointer_motion(event):
+    """Queue a drag sample; no Tk queries happen here."""
+    if state.dragging or state.handle_dragged:
+        x, y = event_position(event)
+        queue_pointer_sample(event.time / 1000, x, y)
+
+def queue_pointer_sample(t, x, y):
+    """Add a drag sample at time t (seconds)."""
+    if recorder is not None:
+        recorder.motion(t, x, y)
+    pointer.push(t, x, y)
+
+def seed_rng(seed):
+    """Seed the RNG behind flicks and background colors."""
+    rng.seed(seed)
+
+def start_recording(path, seed):
+    """Record this session's input and frame times to path."""
+    global recorder
+    from replay import SessionRecorder
+    seed_rng(seed)
+    recorder = SessionRecorder(path, seed, KEYS)
+
+def recorded_key(key, fun):
+    """Wrap a key handler so the key press is recorded."""
+    def handler():
+        if recorder is not None:
+            recorder.key(key)
+        fun()
+    return handler
+
+def on_canvas_configure(event=None):
+    """Refresh the cached canvas origin after the window is resized."""
+    canvas = getscreen().getcanvas()
+    state.canvas_origin = (canvas.canvasx(0), canvas.canvasy(0))
 
 def on_drag_start():
     """Called when dragging starts."""
     # Enable background animation
-    state['background_init'] = True
+    state.background_init = True
 
-def on_drag_stop():
-    """Called when dragging ends."""
-    # Keep momentum from dragging
-    pass
+def on_drag_stop(t=None):
+    """Called when dragging ends at event time t (seconds)."""
+    if not state.dragging:
+        return
+    # Keep momentum from dragging, fitted over the pointer samples just
+    # before the release instead of taken from the final frame's angle
+    # change alone. A pointer held still before letting go gives no fling.
+    spinner_x, spinner_y = state.spinner_position
+    velocity = pointer.angular_velocity(spinner_x, spinner_y, now=t)
+    if velocity is not None:
+        physics.angular_velocity = velocity / 60 * config.drag_scale
 
 def increase_speed():
     """Increase spinner speed."""
-    state['angular_velocity'] += 2  # Increased from 1
+    physics.angular_velocity += 2  # Increased from 1
 
 def decrease_speed():
     """Decrease spinner speed."""
-    state['angular_velocity'] -= 2  # Increased from 1
+    physics.angular_velocity -= 2  # Increased from 1
+
+# Keyboard controls, also used by replay.py to dispatch recorded keys
+KEY_BINDINGS = {
+    'space': flick,
+    'Up': increase_speed,
+    'Down': decrease_speed,
+    's': change_style,
+    'e': toggle_effects,
+    'a': increase_arms,
+    'd': decrease_arms,
+    'r': reset,
+    'p': toggle_profiler,
+}
+
+# Session files store keys by their index here, so new keys go at the end
+KEYS = tuple(KEY_BINDINGS)
 
 # Setup
-def init():
+def init(wall=0):
     setup(2000, 2000, 0, 0)  # Increased window size
     title("Advanced Fidget Spinner")
     hideturtle()
     tracer(False)
     pensize(3)
-    bgcolor(state['background_color'])
-    
-    # Auto-load spinner.png from current directory
-    if PIL_AVAILABLE:
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        spinner_path = os.path.join(current_dir, "spinner.png")
-        if os.path.exists(spinner_path):
-            load_spinner_image(spinner_path)
-            print(f"Loaded spinner image: {spinner_path}")
-        else:
-            print(f"No spinner.png found in {current_dir}")
-    
-    # Controls
-    onkey(flick, 'space')
-    onkey(increase_speed, 'Up')
-    onkey(decrease_speed, 'Down')
-    onkey(change_style, 's')
-    onkey(toggle_effects, 'e')
-    onkey(increase_arms, 'a')
-    onkey(decrease_arms, 'd')
-    onkey(reset, 'r')
+    bgcolor(state.background_color)
+    mark_startup('window')
+    
+    # spinner.png is loaded lazily the first time the image style is chosen
+    if not available_image_path():
+        print(f"No spinner.png found in {os.path.dirname(DEFAULT_IMAGE_PATH)}")
+    
+    # Controls (each key press wakes the idle animation loop)
+    for key, fun in KEY_BINDINGS.items():
+        onkey(wakes(recorded_key(key, fun)), key)
     
     # Mouse handling
     screen = getscreen()
     
     # Create mouse press and release handlers
     def on_click(x, y):
+        if recorder is not None:
+            recorder.click(x, y, 1, 0.0)
         handle_mouse_click(x, y, 1)  # Mouse down
+        wake()
     
-    def on_release(x, y):
-        handle_mouse_click(x, y, 0)  # Mouse up
+    def on_release(event):
+        x, y = event_position(event)
+        t = event.time / 1000  # Same clock as the motion samples
+        if recorder is not None:
+            recorder.click(x, y, 0, t)
+        handle_mouse_click(x, y, 0, t)  # Mouse up
+        wake()
     
     # Use onscreenclick for mouse down events
     screen.onscreenclick(on_click, 1)  # Button 1 press
     
     # Use binding for mouse up events
-    screen.getcanvas().bind("<ButtonRelease-1>", lambda event: on_release(
-        screen.cv.canvasx(event.x) - screen.cv.winfo_width() // 2,
-        screen.cv.winfo_height() // 2 - screen.cv.canvasy(event.y)
-    ))
+    canvas = screen.getcanvas()
+    canvas.bind("<ButtonRelease-1>", on_release)
+    
+    # Motion only queues samples; animate() consumes them once per frame
+    canvas.bind("<B1-Motion>", on_pointer_motion)
+    
+    # Window geometry is cached and only refreshed when the window changes
+    canvas.bind("<Configure>", on_canvas_configure, add="+")
+    on_canvas_configure()
     
     # Implement initialize positions
     resize_me()
-    
-    # Ask for spinner image when starting
-    if PIL_AVAILABLE:
-        pass
+    if wall:
+        build_wall(wall)
     
     # Instructions
     print("=== ENHANCED FIDGET SPINNER ===")
@@ -830,15 +1411,45 @@ def init():
     print("- A/D: Add/remove arms")
     print("- E: Toggle color effects")
     print("- R: Reset spinner")
+    print("- P: Toggle frame profiler overlay")
     print("- Click buttons to use controls")
     
     listen()
-    state['last_update_time'] = time.time()
-    animate()
+    mark_startup('init')
+    wake()
 
 
 
 # Start the program
 if __name__ == "__main__":
-    init()
-    done()
\ No newline at end of file
+    mark_startup('imports')
+    import argparse
+    parser = argparse.ArgumentParser(description="Advanced Fidget Spinner")
+    parser.add_argument('--wall', type=int, default=0, metavar='N',
+                        help="show a wall of N independently flickable spinners")
+    parser.add_argument('--profile-trace', metavar='PATH',
+                        help="profile every frame and write the trace (.json or .csv) on exit")
+    parser.add_argument('--record', metavar='PATH',
+                        help="record input and frame times for replay.py")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="seed for flick directions and background colors")
+    parser.add_argument('--fps', type=int, default=60, choices=FRAME_RATES,
+                        help="target frame rate")
+    parser.add_argument('--startup-profile', action='store_true',
+                        help="print how long each startup phase took")
+    args = parser.parse_args()
+    config.startup_profile = args.startup_profile
+    set_frame_rate(args.fps)
+    if args.profile_trace:
+        profiler.enabled = True
+    seed = args.seed if args.seed is not None else random.randrange(2**63)
+    if args.record:
+        start_recording(args.record, seed)
+    else:
+        seed_rng(seed)
+    init(wall=args.wall)
+    done()
+    if recorder is not None:
+        recorder.close()
+    if args.profile_trace:
+        profiler.export(args.profile_trace)
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""Typed spinner state and configuration for spinner.py."""
+
+class SpinnerConfig:
+    """Tunables set at startup (or by bench.py/replay.py) rather than per frame."""
+
+    __slots__ = ('inertia', 'flick_speed', 'drag_scale', 'arm_length', 'spinner_radius',
+                 'handle_radius', 'base_color_step', 'color_intensity', 'transition_duration',
+                 'bg_update_interval', 'rotation_steps', 'rotation_cache_size',
+                 'precompute_rotations', 'sprite_cache', 'render_workers', 'motion_blur', 'blur_shutter',
+                 'adaptive_quality', 'target_fps', 'interpolate', 'headless', 'startup_profile')
+
+    def __init__(self):
+        self.inertia: float = 0.995           # Higher inertia = longer spin time
+        self.flick_speed: float = 20          # Angular velocity given by flick() (see sweep.py for tuning)
+        self.drag_scale: float = 1.5          # Boost applied to the drag's angular velocity on release
+        self.arm_length: float = 100
+        self.spinner_radius: float = 150
+        self.handle_radius: float = 40
+        self.base_color_step: float = 0.01
+        self.color_intensity: float = 0.5     # Controls how vibrant background colors get
+        self.transition_duration: float = 1.0  # Background transition duration
+        self.bg_update_interval: float = 0.05  # Background update interval (seconds)
+        self.rotation_steps: int = 120        # Angular resolution of cached image frames (3 degrees)
+        self.rotation_cache_size: int = 120   # Max number of rotated PhotoImages kept alive
+        self.precompute_rotations: bool = False  # Render every rotation step when the image loads
+        self.sprite_cache: bool = True        # Keep rotated frames in an on-disk atlas (see atlas.py)
+        self.render_workers: int = 1          # Threads rotating image frames ahead of time (0 = none)
+        self.motion_blur: bool = True         # Blur fast spins using cached frames (see blur.py)
+        self.blur_shutter: float = 1.0        # Fraction of a frame's rotation the blur covers
+        self.adaptive_quality: bool = True    # Trade detail for frame rate under load (see quality.py)
+        self.target_fps: int = 60             # Frame rate the pacer aims for (see pacer.py)
+        self.interpolate: bool = True         # Draw between physics steps when frames outpace them
+        self.headless: bool = False           # Replaying without a display (see replay.py)
+        self.startup_profile: bool = False    # Print startup phase timings (--startup-profile)
+
+class SpinnerState:
+    """Everything about the spinner and its UI that changes while it runs.
+
+    Slots keep attribute access on the per-frame path cheap and instances
+    small. snapshot() and restore() copy the whole state in and out.
+    """
+
+    __slots__ = ('speed', 'background_color', 'target_color', 'last_mouse_pos',
+                 'canvas_origin', 'dragging', 'drag_offset_x', 'drag_offset_y',
+                 'drag_center_x', 'drag_center_y', 'clock', 'last_angle',
+                 'arm_count', 'spinner_style', 'effects_enabled', 'handle_dragged',
+                 'spinner_position', 'handle_position', 'background_init', 'spinner_image',
+                 'original_pil_image', 'current_rotated_image', 'image_path', 'image_loading',
+                 'last_bg_update', 'bg_transition', 'bg_color_string', 'loop_running',
+                 'last_frame_signature', 'frame_start', 'startup_pending', 'ui_elements')
+
+    def __init__(self):
+        self.speed: float = 0
+        self.background_color: tuple = (1.0, 1.0, 1.0)
+        self.target_color: tuple = (1.0, 1.0, 1.0)
+        self.last_mouse_pos: tuple = None
+        self.canvas_origin: tuple = (0, 0)     # Canvas coords of the widget's top-left, refreshed on <Configure>
+        self.dragging: bool = False
+        self.drag_offset_x: float = 0
+        self.drag_offset_y: float = 0
+        self.drag_center_x: float = 0
+        self.drag_center_y: float = 0
+        self.clock: float = 0.0                # Sum of frame times fed to advance_frame()
+        self.last_angle: float = 0
+        self.arm_count: int = 3
+        self.spinner_style: str = 'classic'    # 'classic', 'tri', 'gear', 'image'
+        self.effects_enabled: bool = True
+        self.handle_dragged: bool = False
+        self.spinner_position: tuple = (0, 0)  # Center of spinner
+        self.handle_position: tuple = (0, 0)   # Position of draggable handle
+        self.background_init: bool = True      # Allow background changes
+        self.spinner_image = None              # Store loaded spinner image
+        self.original_pil_image = None         # Resized source image the frames are rotated from
+        self.current_rotated_image = None      # Frame shown by the image item
+        self.image_path: str = None            # Path to spinner image
+        self.image_loading: bool = False       # A background image load is in flight
+        self.last_bg_update: float = 0         # Last background update time
+        self.bg_transition = None              # ColorTransition toward target_color
+        self.bg_color_string: str = None       # Background color last applied to the canvas
+        self.loop_running: bool = False        # Whether an animate() tick is scheduled
+        self.last_frame_signature = None       # Inputs of the last drawn frame, see frame_signature()
+        self.frame_start: float = 0            # perf_counter() at the start of the current frame
+        self.startup_pending: bool = True      # First frame not finished yet
+        self.ui_elements: dict = {}            # UI element id -> (kind, (x, y, w, h)) box
+
+    def snapshot(self):
+        """Copy of every field, as a tuple in slot order."""
+        return tuple(value.copy() if isinstance(value, dict) else value
+                     for value in (getattr(self, name) for name in self.__slots__))
+
+    def restore(self, snapshot):
+        """Put back the fields saved by snapshot()."""
+        for name, value in zip(self.__slots__, snapshot):
+            setattr(self, name, value.copy() if isinstance(value, dict) else value)
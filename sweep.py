@@ -0,0 +1,185 @@
+"""Parameter sweeps of the spin physics, spread across a process pool.
+
+    python sweep.py out/ --inertia 0.99 0.999 10 --flick-speed 10 40 7 --drag-scale 1 2 5
+    python sweep.py out/ --samples 100000 --seed 1    # random sample of the same ranges
+
+Every sample spins the spinner down twice, once from a flick and once from
+a drag released at --drag-speed, exactly as animate() would at 60 fps. Each
+chunk of samples is written to its own file in the output directory as soon
+as it finishes, so rerunning an interrupted sweep only computes the missing
+chunks. The merged results go to results.npz (one array per column), or
+results.csv when NumPy isn't installed.
+"""
+
+import csv
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from physics import SpinnerPhysics
+
+# NumPy is only needed for the .npz output
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+PARAMETERS = ['inertia', 'flick_speed', 'drag_scale']
+COLUMNS = PARAMETERS + ['flick_duration', 'flick_revolutions', 'flick_peak_speed',
+                        'drag_duration', 'drag_revolutions', 'drag_peak_speed']
+
+def linspace(low, high, count):
+    """count evenly spaced values from low to high inclusive."""
+    if count <= 1:
+        return [low]
+    return [low + (high - low) * i / (count - 1) for i in range(count)]
+
+def grid_samples(ranges):
+    """Every combination of the (low, high, count) range of each parameter."""
+    return list(itertools.product(*(linspace(low, high, int(count))
+                                    for low, high, count in ranges)))
+
+def random_samples(ranges, count, seed):
+    """count samples drawn uniformly from each parameter's (low, high) range."""
+    rng = random.Random(seed)
+    return [tuple(rng.uniform(low, high) for low, high, _ in ranges) for _ in range(count)]
+
+def simulate(v0, inertia, frame_time=1 / 60, max_time=600.0):
+    """Spin down from v0 the way animate() does.
+
+    Returns (duration in seconds, total revolutions, peak speed in degrees
+    per tick). Spins still going after max_time are cut off there.
+    """
+    physics = SpinnerPhysics(angular_velocity=v0, inertia=inertia)
+    peak = abs(v0)
+    elapsed = 0.0
+    while physics.is_spinning() and elapsed < max_time:
+        physics.advance(frame_time)
+        elapsed += frame_time
+        peak = max(peak, abs(physics.angular_velocity))
+    return elapsed, abs(physics.turn) / 360, peak
+
+def run_chunk(index, samples, out_dir, drag_speed, frame_time, max_time):
+    """Simulate one chunk and write its columns to out_dir. Returns index."""
+    columns = {name: [] for name in COLUMNS}
+    for inertia, flick_speed, drag_scale in samples:
+        # Same release velocity as spinner.on_drag_stop()
+        drag_v0 = drag_speed / 60 * drag_scale
+        row = (inertia, flick_speed, drag_scale)
+        row += simulate(flick_speed, inertia, frame_time, max_time)
+        row += simulate(drag_v0, inertia, frame_time, max_time)
+        for name, value in zip(COLUMNS, row):
+            columns[name].append(value)
+
+    # Write then rename, so a killed worker never leaves half a chunk behind
+    path = chunk_path(out_dir, index)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(columns, f)
+    os.replace(path + '.tmp', path)
+    return index
+
+def chunk_path(out_dir, index):
+    return os.path.join(out_dir, f"chunk_{index:05d}.json")
+
+def load_manifest(out_dir, spec):
+    """Save the sweep spec, or check it matches the one being resumed."""
+    path = os.path.join(out_dir, 'sweep.json')
+    if os.path.exists(path):
+        with open(path) as f:
+            previous = json.load(f)
+        if previous != spec:
+            raise SystemExit(f"{out_dir} holds a different sweep; use a new output directory")
+    else:
+        with open(path, 'w') as f:
+            json.dump(spec, f, indent=1)
+
+def merge_chunks(out_dir, chunk_count):
+    """Concatenate the chunk files into one columnar results file."""
+    columns = {name: [] for name in COLUMNS}
+    for index in range(chunk_count):
+        with open(chunk_path(out_dir, index)) as f:
+            chunk = json.load(f)
+        for name in COLUMNS:
+            columns[name].extend(chunk[name])
+
+    if NUMPY_AVAILABLE:
+        path = os.path.join(out_dir, 'results.npz')
+        np.savez(path, **{name: np.asarray(values) for name, values in columns.items()})
+    else:
+        path = os.path.join(out_dir, 'results.csv')
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            writer.writerows(zip(*(columns[name] for name in COLUMNS)))
+    return path
+
+def run_sweep(out_dir, samples, chunk_size=256, workers=None, drag_speed=720.0,
+              frame_time=1 / 60, max_time=600.0):
+    """Simulate samples in chunks on a process pool and merge the results.
+
+    Chunks already on disk are skipped. Returns the merged results path.
+    """
+    chunks = [samples[i:i + chunk_size] for i in range(0, len(samples), chunk_size)]
+    pending = [i for i in range(len(chunks)) if not os.path.exists(chunk_path(out_dir, i))]
+    if len(pending) < len(chunks):
+        print(f"Resuming: {len(chunks) - len(pending)} of {len(chunks)} chunks already done")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_chunk, i, chunks[i], out_dir, drag_speed, frame_time, max_time)
+                   for i in pending]
+        for done, future in enumerate(as_completed(futures), 1):
+            future.result()
+            rate = done * chunk_size / (time.perf_counter() - start)
+            print(f"\r{done}/{len(pending)} chunks ({rate:.0f} samples/s)", end='', flush=True)
+    if pending:
+        print()
+    return merge_chunks(out_dir, len(chunks))
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Sweep inertia, flick speed and drag scale")
+    parser.add_argument('output', help="directory for chunk files and merged results")
+    parser.add_argument('--inertia', nargs=3, type=float, default=[0.99, 0.999, 10],
+                        metavar=('LOW', 'HIGH', 'N'))
+    parser.add_argument('--flick-speed', nargs=3, type=float, default=[10, 40, 7],
+                        metavar=('LOW', 'HIGH', 'N'))
+    parser.add_argument('--drag-scale', nargs=3, type=float, default=[1.0, 2.0, 5],
+                        metavar=('LOW', 'HIGH', 'N'))
+    parser.add_argument('--samples', type=int,
+                        help="draw this many random samples instead of the full grid (N is ignored)")
+    parser.add_argument('--seed', type=int, default=0, help="seed for --samples")
+    parser.add_argument('--drag-speed', type=float, default=720.0,
+                        help="pointer angular velocity at drag release (degrees/second)")
+    parser.add_argument('--max-time', type=float, default=600.0,
+                        help="cut off spins longer than this (seconds)")
+    parser.add_argument('--chunk-size', type=int, default=256)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    ranges = [args.inertia, args.flick_speed, args.drag_scale]
+    if args.samples:
+        samples = random_samples(ranges, args.samples, args.seed)
+    else:
+        samples = grid_samples(ranges)
+
+    # Everything that decides which sample lands in which chunk
+    os.makedirs(args.output, exist_ok=True)
+    load_manifest(args.output, {
+        'ranges': ranges, 'samples': args.samples, 'seed': args.seed,
+        'drag_speed': args.drag_speed, 'max_time': args.max_time,
+        'chunk_size': args.chunk_size,
+    })
+
+    path = run_sweep(args.output, samples, args.chunk_size, args.workers,
+                     args.drag_speed, max_time=args.max_time)
+    print(f"Wrote {len(samples)} samples to {path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""Closed-form spin-down against the fixed-timestep integrator."""
+
+import pytest
+
+from physics import (SpinnerPhysics, angle_at, batch_angle_at, batch_spin_down,
+                     final_angle, steps_to_stop, velocity_at)
+
+SPINS = [(20.0, 0.995), (-7.5, 0.99), (3.0, 0.9), (0.5, 0.999), (0.0005, 0.995)]
+
+def close(value):
+    return pytest.approx(value, rel=1e-9, abs=1e-9)
+
+@pytest.mark.parametrize('v0, inertia', SPINS)
+def test_spin_down_matches_step(v0, inertia):
+    physics = SpinnerPhysics(angular_velocity=v0, inertia=inertia)
+    steps = physics.step(10 ** 6)
+    assert not physics.is_spinning()
+    assert steps == steps_to_stop(v0, inertia)
+    assert final_angle(v0, inertia) == close(physics.turn)
+
+@pytest.mark.parametrize('v0, inertia', SPINS)
+def test_angle_and_velocity_at_match_step(v0, inertia):
+    physics = SpinnerPhysics(angular_velocity=v0, inertia=inertia)
+    done = 0
+    for k in (0, 1, 2, 17, 250, 1000, 5000):
+        physics.step(k - done)
+        done = k
+        t = k * physics.timestep
+        assert angle_at(t, v0, inertia) == close(physics.turn)
+        if physics.is_spinning():
+            assert velocity_at(t, v0, inertia) == close(physics.angular_velocity)
+        else:
+            # The integrator only zeroes a stopped spin on its next step
+            assert velocity_at(t, v0, inertia) == 0.0
+
+def test_batch_matches_scalar():
+    np = pytest.importorskip('numpy')
+    v0 = np.array([v for v, _ in SPINS])
+    inertia = np.array([i for _, i in SPINS])
+    result = batch_spin_down(v0, inertia)
+    t = 3.0
+    angles = batch_angle_at(t, v0, inertia)
+    for i, (v, inert) in enumerate(SPINS):
+        assert result['steps'][i] == steps_to_stop(v, inert)
+        assert result['total_rotation'][i] == close(final_angle(v, inert))
+        assert angles[i] == close(angle_at(t, v, inert))
@@ -0,0 +1,157 @@
+"""Recording a session and replaying it reproduces the session exactly."""
+
+import math
+
+import pytest
+
+import replay
+import spinner
+
+SEED = 1234
+
+@pytest.fixture
+def fresh_spinner():
+    """spinner.py in its start-up state, headless, for one session."""
+    initial = spinner.state.snapshot()
+    spinner.config.headless = True
+
+    def restart():
+        spinner.state.restore(initial)
+        spinner.physics.reset(inertia=spinner.config.inertia)
+        spinner.pointer.clear()
+        spinner.recorder = None
+
+    restart()
+    yield restart
+    restart()
+    spinner.config.headless = False
+
+def pose():
+    """Everything the session can change, compared bit for bit."""
+    state = spinner.state
+    return (spinner.physics.turn, spinner.physics.angular_velocity,
+            state.background_color, state.target_color, state.spinner_style,
+            state.arm_count, state.effects_enabled, state.spinner_position,
+            state.handle_position, state.clock)
+
+def run_live(path):
+    """Drive spinner.py through the same recorded handlers init() binds."""
+    spinner.start_recording(path, SEED)
+    spinner.resize_me()
+    poses = []
+    frame_time = 1 / 60
+
+    def frame():
+        spinner.recorder.frame(frame_time)
+        spinner.advance_frame(frame_time)
+        poses.append(pose())
+
+    def key(name):
+        spinner.recorded_key(name, spinner.KEY_BINDINGS[name])()
+
+    def click(x, y, button_state, t=0.0):
+        spinner.recorder.click(x, y, button_state, t)
+        spinner.handle_mouse_click(x, y, button_state, t)
+
+    key('space')
+    for _ in range(30):
+        frame()
+    key('e')
+    key('a')
+    for _ in range(10):
+        frame()
+    key('e')
+
+    # Drag the spinner a quarter turn and let go while still moving
+    click(100, 0, 1)
+    t = 5.0
+    for k in range(1, 30):
+        angle = math.radians(k * 3)
+        t += 0.01
+        spinner.queue_pointer_sample(t, 100 * math.cos(angle), 100 * math.sin(angle))
+        frame()
+    click(*spinner.pointer.latest()[1:], 0, t)
+    key('s')
+    for _ in range(120):
+        frame()
+    spinner.recorder.close()
+    return poses
+
+def test_replay_matches_live_session(tmp_path, fresh_spinner):
+    path = str(tmp_path / 'session.bin')
+    live = run_live(path)
+    assert live[-1][1] != 0  # The drag left the spinner spinning
+
+    fresh_spinner()
+    replayed = []
+    frames, _ = replay.replay_session(path, on_frame=lambda s: replayed.append(pose()))
+    assert frames == len(live)
+    assert replayed == live
+
+def test_render_replays_image_session(tmp_path, fresh_spinner):
+    from PIL import Image
+
+    path = str(tmp_path / 'image.bin')
+    spinner.start_recording(path, SEED)
+    spinner.resize_me()
+    poses = []
+
+    def key(name):
+        spinner.recorded_key(name, spinner.KEY_BINDINGS[name])()
+
+    def frames(count):
+        for _ in range(count):
+            spinner.recorder.frame(1 / 60)
+            spinner.advance_frame(1 / 60)
+            poses.append((spinner.state.spinner_style, spinner.state.image_path))
+
+    # The image style shows its placeholder until the image is installed
+    key('space')
+    for _ in range(3):
+        key('s')
+    frames(10)
+    image = spinner.DEFAULT_IMAGE_PATH
+    spinner.install_spinner_image(image, *spinner.prepare_spinner_image(image, 100))
+    frames(10)
+    spinner.recorder.close()
+    assert poses[0] == ('image', None) and poses[-1] == ('image', image)
+
+    fresh_spinner()
+    clip = str(tmp_path / 'clip.webp')
+    assert replay.main([path, '--render', clip]) == 0
+    with Image.open(clip) as rendered:
+        durations = []
+        for index in range(rendered.n_frames):
+            rendered.seek(index)
+            rendered.load()
+            durations.append(rendered.info['duration'])
+    assert sum(durations) == len(poses) * round(1000 / 60)
+
+def test_replayed_image_keeps_style(tmp_path, fresh_spinner):
+    path = str(tmp_path / 'restyle.bin')
+    spinner.start_recording(path, SEED)
+    spinner.resize_me()
+    # Reach the image style and move on before its image has loaded
+    for _ in range(4):
+        spinner.recorded_key('s', spinner.KEY_BINDINGS['s'])()
+    image = spinner.DEFAULT_IMAGE_PATH
+    size = int(spinner.config.spinner_radius * 2)
+    spinner.install_spinner_image(image, *spinner.prepare_spinner_image(image, size))
+    spinner.recorder.frame(1 / 60)
+    spinner.advance_frame(1 / 60)
+    spinner.recorder.close()
+    live = pose()
+    assert spinner.state.spinner_style == 'classic'
+
+    fresh_spinner()
+    replay.replay_session(path)
+    assert pose() == live
+
+def test_every_bound_key_can_be_recorded(tmp_path, fresh_spinner):
+    path = str(tmp_path / 'keys.bin')
+    recorder = replay.SessionRecorder(path, SEED, spinner.KEYS)
+    for name in spinner.KEY_BINDINGS:
+        recorder.key(name)
+    recorder.close()
+    _, events = replay.read_session(path)
+    assert [spinner.KEYS[index] for _, index in events] == list(spinner.KEY_BINDINGS)